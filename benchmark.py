@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for generation, loading, validation and export.
+
+    python benchmark.py run --scales 1000,10000 --output benchmark_results.json
+    python benchmark.py compare baseline.json benchmark_results.json --threshold 0.15
+
+Every scale point (number of customers) gets a throwaway SQLite database built
+from Sql_code.txt, or the tables of --database-url are dropped and recreated.
+Each generate_* method, the load of each table, each validation category and
+each export format is measured for rows/sec and peak memory (the transaction tables
+are streamed chunk by chunk, as in a normal run, so large scales fit in memory): growth of the
+process RSS by default, or traced Python allocations with --memory tracemalloc
+(exact per stage, but it slows Faker-heavy stages several times over). Generation
+settings (VECTORIZED, VALUE_POOLS, LOAD_MODE, ...) come from the environment as usual.
+"""
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import sqlalchemy
+from sqlalchemy import create_engine
+
+from bulk_loader import get_loader
+from config import Config
+from data_exporter import DataExporter, WRITERS
+from data_generator import DataGenerator
+from data_validator import DataValidator
+from key_registry import KeyRegistry
+from schema_reflector import SchemaReflector, invalidate_snapshot, schema_from_sql
+from utils import PeakRss, chunked
+
+# Measurements shorter than this in the baseline are too noisy to flag.
+MIN_SECONDS = 0.05
+# Peak memory below this (MB) in the baseline is not compared.
+MIN_PEAK_MB = 1.0
+
+
+class Recorder:
+    """Collects one result per measured block: rows, seconds, rows/sec and peak memory in MB."""
+
+    def __init__(self, scale: int, memory: str):
+        self.scale = scale
+        self.memory = memory
+        self.results: List[dict] = []
+
+    @contextmanager
+    def measure(self, stage: str, name: str):
+        """Measure the ``with`` block; a block that sets ``entry['seconds']`` reports that time instead."""
+        entry = {'scale': self.scale, 'stage': stage, 'name': name, 'rows': 0}
+        sampler = PeakRss() if self.memory == 'rss' else None
+        if self.memory == 'tracemalloc':
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield entry
+        seconds = entry.pop('seconds', None)
+        if seconds is None:
+            seconds = time.perf_counter() - start
+        peak = None
+        if sampler is not None:
+            peak = sampler.stop()
+        elif self.memory == 'tracemalloc':
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+        entry['seconds'] = round(seconds, 6)
+        entry['rows_per_sec'] = round(entry['rows'] / seconds, 1) if seconds else 0.0
+        entry['peak_mb'] = round(peak / 2 ** 20, 3) if peak is not None else None
+        self.results.append(entry)
+        memory = f", peak {entry['peak_mb']:.1f} MB" if peak is not None else ""
+        print(f"  {stage:<9} {name:<40} {entry['rows']:>10} rows {seconds:>8.3f}s "
+              f"{entry['rows_per_sec']:>12,.0f} rows/s{memory}")
+
+
+def set_scale(scale: int):
+    """Customers and accounts scale 1:1; employees and branches more slowly."""
+    Config.NUM_CUSTOMERS = scale
+    Config.NUM_ACCOUNTS = scale
+    Config.NUM_EMPLOYEES = max(10, scale // 10)
+    Config.NUM_BRANCHES = max(10, scale // 100)
+
+
+def bench_generate(rec: Recorder, generator: DataGenerator
+                   ) -> Tuple[Dict[str, List[dict]], Dict[str, Callable[[], Iterator[List[dict]]]]]:
+    """Time every generate_* method, feeding each the keys of the tables generated before it.
+
+    Returns the generated rows of each table, and for the transaction tables (which are only
+    counted, chunk by chunk) a callable producing a fresh stream of their chunks.
+    """
+    keys = KeyRegistry(generator.metadata)
+    tables: Dict[str, List[dict]] = {}
+
+    def run(name, method, *args, table=None):
+        with rec.measure('generate', name) as entry:
+            out = method(*args)
+            entry['rows'] = len(out) if isinstance(out, list) else len(next(iter(out.values()), []))
+        if table is not None:
+            keys.assign(table, out)
+            tables[table] = out
+        return out
+
+    def stream(name, chunks):
+        with rec.measure('generate', name) as entry:
+            for chunk in chunks:
+                entry['rows'] += len(chunk)
+
+    def stream_columns(name, method, items):
+        with rec.measure('generate', name) as entry:
+            for block in chunked(items, generator.VECTOR_BLOCK):
+                entry['rows'] += len(next(iter(method(block).values()), []))
+
+    types = run('generate_account_type', generator.generate_account_type, table='account_type')
+    atypes = [r['Account_Type'] for r in types]
+    branches = run('generate_branches', generator.generate_branches, Config.NUM_BRANCHES, table='branches')
+    branch_ids = [r['Branch_id'] for r in branches]
+    customers = run('generate_customers', generator.generate_customers, Config.NUM_CUSTOMERS, table='customers')
+    customer_ids = [r['Customer_id'] for r in customers]
+    employees = run('generate_employees', generator.generate_employees, Config.NUM_EMPLOYEES, table='employees')
+    employee_ids = [r['Employee_id'] for r in employees]
+    accounts = run('generate_accounts', generator.generate_accounts, Config.NUM_ACCOUNTS, branch_ids, atypes,
+                   table='accounts')
+    account_ids = [r['Account_id'] for r in accounts]
+    ac_rows = run('generate_account_customers', generator.generate_account_customers, account_ids, customer_ids,
+                  table='account_customers')
+    with_accounts = sorted({r['Customer_id'] for r in ac_rows})
+    streams = {'banking_transactions': partial(generator.iter_banking_transactions, with_accounts)}
+    stream('iter_banking_transactions', streams['banking_transactions']())
+    cards = run('generate_credit_cards', generator.generate_credit_cards, customer_ids, table='credit_cards')
+    streams['cc_transactions'] = partial(generator.iter_cc_transactions, cards)
+    stream('iter_cc_transactions', streams['cc_transactions']())
+    run('generate_loans', generator.generate_loans, customer_ids, table='loan')
+    run('generate_branch_employees', generator.generate_branch_employees, branch_ids, employee_ids,
+        table='branch_employees')
+    # Vectorized variants, measured on the same inputs.
+    run('generate_accounts_columns', generator.generate_accounts_columns, Config.NUM_ACCOUNTS, branch_ids, atypes)
+    stream_columns('generate_banking_transactions_columns', generator.generate_banking_transactions_columns,
+                   with_accounts)
+    run('generate_credit_cards_columns', generator.generate_credit_cards_columns, customer_ids)
+    stream_columns('generate_cc_transactions_columns', generator.generate_cc_transactions_columns, cards)
+    run('generate_loans_columns', generator.generate_loans_columns, customer_ids)
+    return tables, streams
+
+
+def bench_insert(rec: Recorder, generator: DataGenerator, tables: Dict[str, List[dict]],
+                 streams: Dict[str, Callable[[], Iterator[List[dict]]]]) -> Dict[str, int]:
+    """Load each generated table, parents first, with the configured LOAD_MODE; returns rows per table.
+
+    Streamed tables are generated chunk by chunk again here; only the loads are timed.
+    """
+    loader = get_loader(Config.LOAD_MODE, generator.engine.dialect.name)
+    keys = KeyRegistry(generator.metadata)
+    row_counts: Dict[str, int] = {}
+    with generator.engine.begin() as conn:
+        for table in generator.metadata.sorted_tables:
+            with rec.measure('insert', table.name) as entry:
+                if table.name in streams:
+                    seconds = 0.0
+                    for chunk in streams[table.name]():
+                        keys.assign(table.name, chunk)
+                        start = time.perf_counter()
+                        loader.load(conn, table, chunk)
+                        seconds += time.perf_counter() - start
+                        entry['rows'] += len(chunk)
+                    entry['seconds'] = seconds
+                else:
+                    rows = tables.get(table.name, [])
+                    for chunk in chunked(rows, Config.CHUNK_SIZE):
+                        loader.load(conn, table, chunk)
+                    entry['rows'] = len(rows)
+            row_counts[table.name] = entry['rows']
+    return row_counts
+
+
+def bench_validate(rec: Recorder, reflector: SchemaReflector, row_counts: Dict[str, int]):
+    """Run the validation tasks in report order, one measurement per category."""
+    validator = DataValidator(reflector)
+    categories: Dict[str, list] = OrderedDict()
+    for task in validator.build_tasks():
+        categories.setdefault(task.category, []).append(task)
+    for category, tasks in categories.items():
+        # Table stats are cached on the validator; start each category cold, as validate_all does.
+        validator._stats = {}
+        with rec.measure('validate', category) as entry:
+            for task in tasks:
+                task.run()
+            entry['rows'] = sum(row_counts.get(t, 0) for t in {t for task in tasks for t in task.tables})
+
+
+def bench_export(rec: Recorder, reflector: SchemaReflector, workdir: Path):
+    """Export every table once per format."""
+    for fmt in WRITERS:
+        exporter = DataExporter(reflector, export_dir=str(workdir / f"exports-{fmt}"))
+        with rec.measure('export', fmt) as entry:
+            for table_name in reflector.get_all_tables():
+                exporter.export_table(table_name, [fmt])
+            entry['rows'] = sum(exporter.row_counts.values())
+
+
+def run_scale(scale: int, args) -> List[dict]:
+    print(f"\nScale: {scale} customers")
+    set_scale(scale)
+    workdir = Path(tempfile.mkdtemp(prefix='mockdata-bench-'))
+    url = args.database_url or f"sqlite:///{workdir / 'bench.db'}"
+    rec = Recorder(scale, args.memory)
+    try:
+        metadata = schema_from_sql(args.sql_file)
+        engine = create_engine(url)
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+        engine.dispose()
+        # --database-url is reused across scales; its tables were just recreated.
+        invalidate_snapshot(url)
+        reflector = SchemaReflector(url)
+        reflector.reflect_schema()
+        generator = DataGenerator(seed=args.seed, reflector=reflector)
+        tables, streams = bench_generate(rec, generator)
+        row_counts = bench_insert(rec, generator, tables, streams)
+        bench_validate(rec, reflector, row_counts)
+        bench_export(rec, reflector, workdir)
+        reflector.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return rec.results
+
+
+def run(args) -> int:
+    # Keep benchmark runs from reading or writing the project's caches.
+    Config.SCHEMA_CACHE_DIR = ''
+    Config.VALUE_POOL_CACHE_DIR = ''
+    Config.VALIDATION_CACHE_FILE = ''
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+    if args.memory == 'tracemalloc':
+        tracemalloc.start()
+    results = []
+    for scale in scales:
+        results.extend(run_scale(scale, args))
+    report = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'seed': args.seed,
+            'scales': scales,
+            'memory': args.memory,
+            'vectorized': Config.VECTORIZED,
+            'value_pools': Config.VALUE_POOLS,
+            'load_mode': Config.LOAD_MODE,
+            'database': 'sqlite' if not args.database_url else sqlalchemy.make_url(args.database_url).get_backend_name(),
+        },
+        'results': results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\n✓ Results saved to: {args.output}")
+    return 0
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> List[dict]:
+    """Pair measurements by (scale, stage, name); returns every pair with a ``regressions`` list."""
+    base = {(r['scale'], r['stage'], r['name']): r for r in baseline['results']}
+    rows = []
+    for r in current['results']:
+        b = base.get((r['scale'], r['stage'], r['name']))
+        if b is None:
+            continue
+        regressions = []
+        speed = r['rows_per_sec'] / b['rows_per_sec'] - 1 if b['rows_per_sec'] else 0.0
+        if b['seconds'] >= MIN_SECONDS and speed < -threshold:
+            regressions.append('throughput')
+        memory: Optional[float] = None
+        if b.get('peak_mb') is not None and r.get('peak_mb') is not None and b['peak_mb'] >= MIN_PEAK_MB:
+            memory = r['peak_mb'] / b['peak_mb'] - 1
+            if memory > threshold:
+                regressions.append('memory')
+        rows.append({**r, 'speed_change': speed, 'memory_change': memory, 'regressions': regressions})
+    return rows
+
+
+def compare(args) -> int:
+    baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+    current = json.loads(Path(args.current).read_text(encoding='utf-8'))
+    rows = compare_results(baseline, current, args.threshold)
+    for row in rows:
+        memory = f"{row['memory_change']:+7.1%}" if row['memory_change'] is not None else "    n/a"
+        flag = f"  ❌ {', '.join(row['regressions'])} regression" if row['regressions'] else ""
+        print(f"  {row['scale']:>8} {row['stage']:<9} {row['name']:<40} "
+              f"rows/s {row['speed_change']:+7.1%}  peak {memory}{flag}")
+    regressed = [row for row in rows if row['regressions']]
+    print()
+    if regressed:
+        print(f"❌ {len(regressed)} of {len(rows)} measurements regressed by more than {args.threshold:.0%}")
+        return 1
+    print(f"✓ No regressions beyond {args.threshold:.0%} across {len(rows)} measurements")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark generation, loading, validation and export.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="Run the benchmark and save the results as JSON")
+    run_parser.add_argument('--scales', default='1000,10000',
+                            help="Comma-separated customer counts, e.g. 1000,100000,1000000")
+    run_parser.add_argument('--output', default='benchmark_results.json')
+    run_parser.add_argument('--seed', type=int, default=Config.RANDOM_SEED)
+    run_parser.add_argument('--sql-file', default='Sql_code.txt', help="DDL script the tables are created from")
+    run_parser.add_argument('--database-url', default=None,
+                            help="Throwaway database to use instead of a temporary SQLite file (its tables are dropped)")
+    run_parser.add_argument('--memory', choices=['rss', 'tracemalloc', 'off'], default='rss',
+                            help="Peak memory metric: RSS growth sampled on a thread (default), traced Python "
+                                 "allocations (precise but slow), or none")
+    compare_parser = commands.add_parser('compare', help="Flag regressions against a baseline results file")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.15,
+                                help="Relative rows/sec drop or peak memory growth reported as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return run(args) if args.command == 'run' else compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
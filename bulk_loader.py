@@ -0,0 +1,114 @@
+"""
+Bulk loading module.
+Loads generated row chunks through the dialect's native bulk path: on MySQL
+each chunk is staged as a CSV file and loaded with LOAD DATA LOCAL INFILE; on
+SQLite rows go straight into one prepared INSERT on the raw DB-API cursor.
+Other dialects keep the SQLAlchemy executemany path.
+
+Staged files use MySQL's LOAD DATA conventions: comma separated, optionally
+double-quoted, backslash as escape character and \\N for NULL.
+"""
+import csv
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, List, Optional
+
+from sqlalchemy import Table, insert
+
+from config import Config
+
+NULL = '\\N'
+
+
+def stage_value(value: Any) -> str:
+    """Encode one value for a staged CSV field."""
+    if value is None:
+        return NULL
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return str(value).replace('\\', '\\\\')
+
+
+class RowLoader:
+    """The default path: SQLAlchemy executemany of ``insert(table)``."""
+
+    def __init__(self, staging_dir: Optional[str] = None):
+        self.staging_dir = staging_dir
+
+    def load(self, conn, table: Table, rows: List[dict]):
+        conn.execute(insert(table), rows)
+
+
+class StagedLoader(RowLoader, ABC):
+    """Writes each chunk to a temporary CSV file and hands it to ``load_file``."""
+
+    def load(self, conn, table: Table, rows: List[dict]):
+        if self.staging_dir:
+            Path(self.staging_dir).mkdir(parents=True, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix=f"{table.name}-", suffix='.csv', dir=self.staging_dir or None)
+        os.close(fd)
+        try:
+            columns = self.stage(table, rows, path)
+            self.load_file(conn, table, columns, path)
+        finally:
+            os.remove(path)
+
+    def stage(self, table: Table, rows: List[dict], path: str) -> List[str]:
+        """Write ``rows`` to ``path`` and return the staged column names, in table order."""
+        columns = [c.name for c in table.columns if c.name in rows[0]]
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            for row in rows:
+                writer.writerow([stage_value(row.get(col)) for col in columns])
+        return columns
+
+    @abstractmethod
+    def load_file(self, conn, table: Table, columns: List[str], path: str):
+        """Load the staged file at ``path`` into ``table``."""
+
+
+class MySQLLoader(StagedLoader):
+    """LOAD DATA LOCAL INFILE; the client connection needs ``local_infile`` enabled."""
+
+    def load_file(self, conn, table: Table, columns: List[str], path: str):
+        quote = conn.dialect.identifier_preparer.quote
+        file_name = Path(path).as_posix().replace('\\', '\\\\').replace("'", "\\'")
+        conn.exec_driver_sql(
+            f"LOAD DATA LOCAL INFILE '{file_name}' INTO TABLE {quote(table.name)} "
+            f"CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\\\\' "
+            f"LINES TERMINATED BY '\\n' "
+            f"({', '.join(quote(col) for col in columns)})"
+        )
+
+
+class SQLiteLoader(RowLoader):
+    """One prepared INSERT on the raw sqlite3 cursor, values converted by the column types' bind processors."""
+
+    def load(self, conn, table: Table, rows: List[dict]):
+        columns = [c for c in table.columns if c.name in rows[0]]
+        processors = [(c.name, c.type.bind_processor(conn.dialect)) for c in columns]
+        quote = conn.dialect.identifier_preparer.quote
+        statement = (f"INSERT INTO {quote(table.name)} ({', '.join(quote(c.name) for c in columns)}) "
+                     f"VALUES ({', '.join('?' for _ in columns)})")
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.executemany(statement, ([process(row.get(name)) if process else row.get(name)
+                                            for name, process in processors] for row in rows))
+        finally:
+            cursor.close()
+
+
+LOADERS = {'mysql': MySQLLoader, 'sqlite': SQLiteLoader}
+
+
+def get_loader(mode: Optional[str], dialect_name: str, staging_dir: Optional[str] = None) -> RowLoader:
+    """Loader for ``mode`` ('insert' or 'bulk'); 'bulk' falls back to inserts where no native path exists."""
+    mode = mode or Config.LOAD_MODE
+    if mode not in ('insert', 'bulk'):
+        raise ValueError(f"Unknown load mode: {mode}")
+    staging_dir = staging_dir if staging_dir is not None else Config.BULK_STAGING_DIR
+    loader_cls = LOADERS.get(dialect_name, RowLoader) if mode == 'bulk' else RowLoader
+    return loader_cls(staging_dir)
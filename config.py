@@ -8,6 +8,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def parse_table_map(value):
+    """Parse per-table overrides written as ``table=N,table=N``."""
+    overrides = {}
+    for item in value.split(','):
+        if item.strip():
+            table, number = item.split('=', 1)
+            overrides[table.strip()] = int(number)
+    return overrides
+
+
 class Config:
     """Configuration class for database and data generation settings."""
     
@@ -16,12 +26,51 @@ class Config:
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     DB_NAME = os.getenv('DB_NAME', 'citi_db')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    SCHEMA_CACHE_DIR = os.getenv('SCHEMA_CACHE_DIR', '.schema_cache')
     
     RANDOM_SEED = int(os.getenv('RANDOM_SEED', 42))
     NUM_CUSTOMERS = int(os.getenv('NUM_CUSTOMERS', 500))
     NUM_EMPLOYEES = int(os.getenv('NUM_EMPLOYEES', 500))
     NUM_BRANCHES = int(os.getenv('NUM_BRANCHES', 500))
     NUM_ACCOUNTS = int(os.getenv('NUM_ACCOUNTS', 500))
+    CHUNK_SIZE = int(os.getenv('CHUNK_SIZE', 10000))
+    VECTORIZED = os.getenv('VECTORIZED', 'false').lower() in ('1', 'true', 'yes')
+    SHARDED = os.getenv('SHARDED', 'false').lower() in ('1', 'true', 'yes')
+    GENERATION_WORKERS = int(os.getenv('GENERATION_WORKERS', 1))
+    SHARD_SIZE = int(os.getenv('SHARD_SIZE', 10000))
+    VALUE_POOLS = os.getenv('VALUE_POOLS', 'false').lower() in ('1', 'true', 'yes')
+    VALUE_POOL_SIZE = int(os.getenv('VALUE_POOL_SIZE', 5000))
+    VALUE_POOL_CACHE_DIR = os.getenv('VALUE_POOL_CACHE_DIR', '')
+    COUNTER_RNG = os.getenv('COUNTER_RNG', 'false').lower() in ('1', 'true', 'yes')
+    LOAD_MODE = os.getenv('LOAD_MODE', 'insert')
+    BULK_STAGING_DIR = os.getenv('BULK_STAGING_DIR', '')
+    INSERT_BATCH_SIZE = int(os.getenv('INSERT_BATCH_SIZE', 0))
+    COMMIT_INTERVAL = int(os.getenv('COMMIT_INTERVAL', 0))
+    TABLE_BATCH_SIZES = parse_table_map(os.getenv('TABLE_BATCH_SIZES', ''))
+    TABLE_COMMIT_INTERVALS = parse_table_map(os.getenv('TABLE_COMMIT_INTERVALS', ''))
+    RESET_MODE = os.getenv('RESET_MODE', 'delete')
+    DEFER_INDEXES = os.getenv('DEFER_INDEXES', 'false').lower() in ('1', 'true', 'yes')
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 5000))
+    EXPORT_WORKERS = int(os.getenv('EXPORT_WORKERS', 1))
+    VALIDATION_WORKERS = int(os.getenv('VALIDATION_WORKERS', 1))
+    VALIDATION_TIMEOUT = float(os.getenv('VALIDATION_TIMEOUT', 0))
+    VALIDATION_SAMPLE_SIZE = int(os.getenv('VALIDATION_SAMPLE_SIZE', 5))
+    VALIDATION_CACHE_FILE = os.getenv('VALIDATION_CACHE_FILE', '')
+    METRICS_FILE = os.getenv('METRICS_FILE', 'metrics.json')
+    METRICS_PROMETHEUS_FILE = os.getenv('METRICS_PROMETHEUS_FILE', '')
+    SQL_PROFILE = os.getenv('SQL_PROFILE', 'false').lower() in ('1', 'true', 'yes')
+    SQL_PROFILE_TOP = int(os.getenv('SQL_PROFILE_TOP', 20))
+    
+    @classmethod
+    def batch_size(cls, table_name):
+        """Rows per INSERT/LOAD statement for a table (0: one statement per generated chunk)."""
+        return cls.TABLE_BATCH_SIZES.get(table_name, cls.INSERT_BATCH_SIZE)
+    
+    @classmethod
+    def commit_interval(cls, table_name):
+        """Rows of a table loaded between commits (0: a single transaction for the whole load)."""
+        return cls.TABLE_COMMIT_INTERVALS.get(table_name, cls.COMMIT_INTERVAL)
     
     @classmethod
     def get_database_url(cls):
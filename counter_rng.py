@@ -0,0 +1,314 @@
+"""
+Counter-based (random-access) generation module.
+Every generated value is a pure function of (seed, table, column, row counter): a
+splitmix64 hash of the counter keyed by the column, evaluated for whole index arrays at
+once in NumPy. Any row can be regenerated on its own, rows and tables can be generated in
+any order, and one table can be regenerated without replaying the others.
+
+Rows are addressed by their 0-based position in the table; child rows (transactions,
+branch assignments, co-owners) by (parent row, ordinal), folded into one counter with
+``child_counter``. Faker-backed text comes from seeded value pools indexed the same way.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import MetaData
+
+from utils import derive_seed, ensure_max_length, money
+from value_pool import ValuePools
+
+GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX2 = np.uint64(0x94D049BB133111EB)
+# Ordinals per parent row; must exceed the largest child count drawn below.
+CHILD_STRIDE = 64
+
+
+def splitmix64(x: np.ndarray) -> np.ndarray:
+    """The splitmix64 finalizer applied elementwise to a uint64 array (arithmetic wraps mod 2**64)."""
+    z = x ^ (x >> np.uint64(30))
+    z = z * MIX1
+    z = z ^ (z >> np.uint64(27))
+    z = z * MIX2
+    return z ^ (z >> np.uint64(31))
+
+
+def child_counter(parent_rows: np.ndarray, ordinals: np.ndarray) -> np.ndarray:
+    """Counter of the ``ordinals``-th child of each parent row."""
+    return np.asarray(parent_rows, dtype=np.uint64) * np.uint64(CHILD_STRIDE) + np.asarray(ordinals, dtype=np.uint64)
+
+
+def fan_out(parent_rows: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Repeat each parent row ``counts`` times; returns (parent row, child counter) per child."""
+    parents = np.repeat(parent_rows, counts)
+    starts = np.cumsum(counts) - counts
+    ordinals = np.arange(len(parents)) - np.repeat(starts, counts)
+    return parents, child_counter(parents, ordinals)
+
+
+class CounterRng:
+    """Stateless random draws for one table: the same (column, row) always yields the same value."""
+
+    def __init__(self, seed: int, table: str):
+        self.seed = seed
+        self.table = table
+        self._keys: Dict[str, np.uint64] = {}
+
+    def bits(self, column: str, rows) -> np.ndarray:
+        key = self._keys.get(column)
+        if key is None:
+            key = self._keys[column] = np.uint64(derive_seed(self.seed, 'counter', self.table, column))
+        rows = np.asarray(rows, dtype=np.uint64)
+        # Wrapping is intended; NumPy only warns about it for scalars (a single row index).
+        with np.errstate(over='ignore'):
+            return splitmix64(key + (rows + np.uint64(1)) * GOLDEN)
+
+    def random(self, column: str, rows) -> np.ndarray:
+        """Floats in [0, 1)."""
+        return (self.bits(column, rows) >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+    def uniform(self, column: str, rows, low, high) -> np.ndarray:
+        return low + (np.asarray(high) - low) * self.random(column, rows)
+
+    def integers(self, column: str, rows, low: int, high: int) -> np.ndarray:
+        """Integers in [low, high] (inclusive, like ``random.randint``)."""
+        return low + (self.bits(column, rows) % np.uint64(high - low + 1)).astype(np.int64)
+
+    def choice(self, column: str, rows, options: Sequence) -> np.ndarray:
+        options = np.asarray(options, dtype=object)
+        return options[self.integers(column, rows, 0, len(options) - 1)]
+
+    def past_dates(self, column: str, rows, years_back_min: int = 0, years_back_max: int = 30) -> np.ndarray:
+        days = self.integers(column, rows, years_back_min * 365, years_back_max * 365)
+        return np.datetime64(date.today(), 'D') - days.astype('timedelta64[D]')
+
+
+def _years_ahead(years: int) -> date:
+    today = date.today()
+    try:
+        return date(today.year + years, today.month, today.day)
+    except ValueError:
+        return today + timedelta(days=365 * years)
+
+
+class CounterRows:
+    """Column builders that derive each table's values from row counters instead of a shared stream.
+
+    Every method takes the row positions to build (any subset, in any order) and returns
+    equally sized column arrays, like the DataGenerator ``*_columns`` methods.
+    """
+
+    def __init__(self, seed: int, metadata: MetaData, pools: Optional[ValuePools] = None):
+        self.seed = seed
+        self.metadata = metadata
+        self.pools = pools or ValuePools(seed)
+        self._rngs: Dict[str, CounterRng] = {}
+
+    def rng(self, table: str) -> CounterRng:
+        rng = self._rngs.get(table)
+        if rng is None:
+            rng = self._rngs[table] = CounterRng(self.seed, table)
+        return rng
+
+    def _len(self, table: str, column: str) -> Optional[int]:
+        return getattr(self.metadata.tables[table].c[column].type, 'length', None)
+
+    def _text(self, table: str, column: str, field: str, rows, **kwargs) -> np.ndarray:
+        pool = self.pools.get(field, self._len(table, column), **kwargs)
+        return pool.take(self.rng(table).integers(column, rows, 0, len(pool) - 1))
+
+    def _clip(self, table: str, column: str, values: Sequence[str]) -> np.ndarray:
+        max_len = self._len(table, column)
+        return np.asarray([ensure_max_length(v, max_len) for v in values], dtype=object)
+
+    def _address(self, table: str, rows) -> Dict[str, np.ndarray]:
+        r = self.rng(table)
+        return {
+            'Street_Address': self._text(table, 'Street_Address', 'street_address', rows),
+            'City': self._text(table, 'City', 'city', rows),
+            'State': self._text(table, 'State', 'state_abbr', rows, include_territories=False),
+            'Zipcode': r.integers('Zipcode', rows, 501, 99950),
+        }
+
+    def branches(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        r = self.rng('branches')
+        address = self._address('branches', rows)
+        phone = zip(r.integers('Phone_Area', rows, 200, 999), r.integers('Phone_Exchange', rows, 100, 999),
+                    r.integers('Phone_Line', rows, 1000, 9999))
+        return {
+            'Branch_Name': self._clip('branches', 'Branch_Name', [f"{city} Branch" for city in address['City']]),
+            **address,
+            'Phone_Number': self._clip('branches', 'Phone_Number', [f"{a}-{b}-{c}" for a, b, c in phone]),
+        }
+
+    def _person(self, table: str, rows, min_age: int, max_age: int) -> Dict[str, np.ndarray]:
+        r = self.rng(table)
+        days = r.integers('Age', rows, min_age, max_age) * 365 + r.integers('Birthday', rows, 0, 364)
+        return {
+            'First_Name': self._text(table, 'First_Name', 'first_name', rows),
+            'Last_Name': self._text(table, 'Last_Name', 'last_name', rows),
+            'Date_of_Birth': np.datetime64(date.today(), 'D') - days.astype('timedelta64[D]'),
+            'Sex': self._clip(table, 'Sex', r.choice('Sex', rows, ['M', 'F'])),
+        }
+
+    def customers(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        person = self._person('customers', rows, 18, 90)
+        domains = self._text('customers', 'Email', 'free_email_domain', rows)
+        max_len = self._len('customers', 'Email') or 255
+        emails = []
+        # The row number keeps addresses unique without tracking the ones already issued.
+        for first, last, domain, row in zip(person['First_Name'], person['Last_Name'], domains, np.asarray(rows).tolist()):
+            suffix = f".{row}@{domain}"
+            local = f"{first}.{last}".lower().replace(' ', '').replace("'", '')
+            emails.append(local[:max(1, max_len - len(suffix))] + suffix)
+        return {
+            'First_Name': person['First_Name'],
+            'Last_Name': person['Last_Name'],
+            'Date_of_Birth': person['Date_of_Birth'],
+            **self._address('customers', rows),
+            'Email': self._clip('customers', 'Email', emails),
+            'Sex': person['Sex'],
+        }
+
+    def employees(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        person = self._person('employees', rows, 21, 70)
+        levels = self._clip('employees', 'Level_of_Access', ['Teller', 'Manager', 'Analyst', 'Clerk'])
+        return {
+            'First_Name': person['First_Name'],
+            'Last_Name': person['Last_Name'],
+            'Supervisor_id': np.full(len(rows), None, dtype=object),
+            'Level_of_Access': self.rng('employees').choice('Level_of_Access', rows, levels),
+            'Date_of_Birth': person['Date_of_Birth'],
+            **self._address('employees', rows),
+            'Sex': person['Sex'],
+        }
+
+    def accounts(self, rows: np.ndarray, branch_ids: np.ndarray, min_map: Dict[str, float]) -> Dict[str, np.ndarray]:
+        """Accounts with minimum balances already applied (see DataGenerator.apply_minimum_balances)."""
+        r = self.rng('accounts')
+        types = r.choice('Account_Type', rows, list(min_map))
+        minimum = np.asarray([min_map[t] for t in types], dtype=np.float64)
+        balance = money(r.uniform('Account_Balance', rows, 0, 50000))
+        topped_up = money(r.uniform('Minimum_Balance', rows, minimum, np.maximum(minimum + 1000, minimum + 1)))
+        return {
+            'Account_Balance': np.where(balance < minimum, topped_up, balance),
+            'Branch_id': np.asarray(branch_ids)[r.integers('Branch_id', rows, 0, len(branch_ids) - 1)],
+            'Date_Opened': r.past_dates('Date_Opened', rows, 0, 20),
+            'Account_Type': types,
+        }
+
+    def _children(self, table: str, parent_rows: np.ndarray, low: int, high: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(parent row, child counter) per child, ``low``..``high`` children per parent, and the counts."""
+        parent_rows = np.asarray(parent_rows, dtype=np.int64)
+        counts = self.rng(table).integers('Children', parent_rows, low, high)
+        parents, counters = fan_out(parent_rows, counts)
+        return parents, counters, counts
+
+    def _pairs(self, table: str, parent_rows: np.ndarray, n_targets: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(parent row, target index, child counter) for one or two distinct targets per parent.
+
+        Two draws with probability 1/3, like ``random.choice([1, 1, 2])``; a second draw that
+        repeats the first is dropped.
+        """
+        parent_rows = np.asarray(parent_rows, dtype=np.int64)
+        counts = np.where(self.rng(table).integers('Children', parent_rows, 0, 2) == 2, 2, 1)
+        parents, counters = fan_out(parent_rows, counts)
+        targets = self.rng(table).integers('Target', counters, 0, n_targets - 1)
+        keep = np.ones(len(parents), dtype=bool)
+        keep[1:] = ~((parents[1:] == parents[:-1]) & (targets[1:] == targets[:-1]))
+        return parents[keep], targets[keep], counters[keep]
+
+    def account_customers(self, account_rows: np.ndarray, n_customers: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(account row, customer row) ownership pairs."""
+        accounts, customers, _ = self._pairs('account_customers', account_rows, n_customers)
+        return accounts, customers
+
+    def banking_transactions(self, customer_rows: np.ndarray, customer_ids: np.ndarray) -> Dict[str, np.ndarray]:
+        table = 'banking_transactions'
+        r = self.rng(table)
+        parents, rows, _ = self._children(table, customer_rows, 5, 20)
+        tx_types = self._clip(table, 'Transaction_Type', ['Deposit', 'Withdrawal', 'Transfer', 'Payment'])
+        return {
+            'Transaction_Type': r.choice('Transaction_Type', rows, tx_types),
+            'Description': self._text(table, 'Description', 'sentence', rows, nb_words=4),
+            'Amount': money(r.uniform('Amount', rows, 1, 2500)),
+            'Transaction_Date': r.past_dates('Transaction_Date', rows, 0, 10),
+            'Customer_id': np.asarray(customer_ids)[parents],
+        }
+
+    def credit_cards(self, customer_rows: np.ndarray, customer_ids: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Cards for the customers that get one (60%), and those customers' rows."""
+        table = 'credit_cards'
+        r = self.rng(table)
+        customer_rows = np.asarray(customer_rows, dtype=np.int64)
+        rows = customer_rows[r.random('Has_Card', customer_rows) < 0.6]
+        expiry = np.asarray([_years_ahead(y) for y in range(6)], dtype='datetime64[D]')
+        numbers = r.bits('CC_number', rows) % np.uint64(10 ** 16)
+        return {
+            'CC_number': self._clip(table, 'CC_number', [f"{n:016d}" for n in numbers.tolist()]),
+            'Maximum_Limit': money(r.uniform('Maximum_Limit', rows, 1000, 20000)),
+            'Expiry_Date': expiry[r.integers('Expiry_Date', rows, 1, 5)],
+            'Credit_Score': r.integers('Credit_Score', rows, 300, 850),
+            'Customer_id': np.asarray(customer_ids)[rows],
+        }, rows
+
+    def cc_transactions(self, card_rows: np.ndarray, cards: List[dict]) -> Dict[str, np.ndarray]:
+        """Transactions of ``cards``, whose owners are at ``card_rows`` in the customer table."""
+        table = 'cc_transactions'
+        r = self.rng(table)
+        _, rows, counts = self._children(table, card_rows, 5, 30)
+        index = np.repeat(np.arange(len(cards)), counts)
+        expiry = np.asarray([c['Expiry_Date'] for c in cards], dtype='datetime64[D]')[index]
+        tx_date = r.past_dates('Transaction_Date', rows, 0, 5)
+        late = tx_date > expiry
+        back = r.integers('Expiry_Offset', rows, 1, 365).astype('timedelta64[D]')
+        tx_date[late] = expiry[late] - back[late]
+        return {
+            'CC_Number': np.asarray([c['CC_number'] for c in cards], dtype=object)[index],
+            'Transaction_Date': tx_date,
+            'Amount': money(r.uniform('Amount', rows, 1, 2500)),
+            'Merchant_Details': self._text(table, 'Merchant_Details', 'company', rows),
+        }
+
+    def loans(self, customer_rows: np.ndarray, customer_ids: np.ndarray) -> Dict[str, np.ndarray]:
+        table = 'loan'
+        r = self.rng(table)
+        customer_rows = np.asarray(customer_rows, dtype=np.int64)
+        rows = customer_rows[r.random('Has_Loan', customer_rows) < 0.35]
+        amount_taken = money(r.uniform('Loan_Amount_Taken', rows, 2000, 100000))
+        loan_types = self._clip(table, 'Loan_Type', ['Home', 'Auto', 'Personal', 'Student'])
+        return {
+            'Duration_in_Years': money(r.uniform('Duration_in_Years', rows, 0.5, 30.0)),
+            'Loan_Start_Date': r.past_dates('Loan_Start_Date', rows, 0, 15),
+            'Interest_Rate': money(r.uniform('Interest_Rate', rows, 2.5, 18.0)),
+            'Loan_Amount_Taken': amount_taken,
+            'Loan_Amount_Repaid': money(r.uniform('Loan_Amount_Repaid', rows, 0, amount_taken)),
+            'Loan_Type': r.choice('Loan_Type', rows, loan_types),
+            'Customer_id': np.asarray(customer_ids)[rows],
+        }
+
+    def branch_employees(self, employee_rows: np.ndarray, employee_ids: np.ndarray,
+                         branch_ids: np.ndarray) -> Dict[str, np.ndarray]:
+        table = 'branch_employees'
+        r = self.rng(table)
+        employees, branches, rows = self._pairs(table, employee_rows, len(branch_ids))
+        today = np.datetime64(date.today(), 'D')
+        start = r.past_dates('Start_Date', rows, 0, 10)
+        end = start + r.integers('Tenure', rows, 30, 2000).astype('timedelta64[D]')
+        has_end = (r.random('Has_End', rows) < 0.7) & (end <= today)
+        return {
+            'Branch_id': np.asarray(branch_ids)[branches],
+            'Employee_id': np.asarray(employee_ids)[employees],
+            'Start_Date': start,
+            'End_Date': np.where(has_end, end.astype(object), None),
+        }
+
+    def supervisors(self, employee_ids: Sequence[int]) -> Dict[int, int]:
+        """Supervisor ids for 60% of employees (never themselves), keyed by employee id; drawn per employee row."""
+        r = self.rng('employees')
+        ids = np.asarray(employee_ids, dtype=np.int64)
+        rows = np.arange(len(ids))
+        chosen = ids[r.integers('Supervisor_id', rows, 0, len(ids) - 1)]
+        mask = (r.random('Has_Supervisor', rows) < 0.6) & (chosen != ids)
+        return dict(zip(ids[mask].tolist(), chosen[mask].tolist()))
@@ -1,109 +1,322 @@
 """
-Data export module for JSON and CSV formats.
-Exports all tables from the database to ./exports/ directory.
+Data export module for JSON, JSON Lines and CSV formats (optionally gzip-compressed).
+Each table is scanned once, in primary key order, and fanned out to one writer per format.
+Exports all tables from the database to ./exports/ directory; DirectExporter writes the
+same files from generated rows without a database.
 """
 import csv
+import gzip
+import io
 import json
 import os
+import threading
+import time
+from decimal import Decimal, ROUND_HALF_UP
+from json.encoder import encode_basestring as encode_json_string
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Date, Integer, MetaData, Numeric, String, Table, select, func, text
 from sqlalchemy.engine import Engine
 
+from config import Config
+from key_registry import KeyRegistry
+from metrics import Metrics
 from schema_reflector import SchemaReflector
 
 
+def export_value(value):
+    """Convert a database value to the string form used by every export format (None stays None)."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='ignore')
+    return str(value) if value is not None else None
+
+
+class JsonWriter:
+    """Writes rows as a pretty-printed JSON array, one element at a time."""
+    extension = 'json'
+
+    def __init__(self, f, columns: List[str]):
+        self.columns = columns
+        # Same layout as json.dump(data, f, indent=2): each element indented by one level.
+        # Values are always strings or None (see export_value), so elements are assembled from
+        # pre-encoded keys instead of going through the pure-Python indenting encoder.
+        self.prefixes = [f'\n    {encode_json_string(c)}: ' for c in columns]
+        self.f = f
+        self.f.write('[')
+        self.empty = True
+
+    def write(self, values: List):
+        self.f.write('\n  {' if self.empty else ',\n  {')
+        if self.prefixes:
+            self.f.write(','.join(prefix + ('null' if v is None else encode_json_string(v))
+                                  for prefix, v in zip(self.prefixes, values)))
+            self.f.write('\n  }')
+        else:
+            self.f.write('}')
+        self.empty = False
+
+    def close(self):
+        self.f.write(']' if self.empty else '\n]')
+        self.f.close()
+
+
+class CsvWriter:
+    """Writes rows as CSV with a header line; NULLs become empty fields."""
+    extension = 'csv'
+
+    def __init__(self, f, columns: List[str]):
+        self.f = f
+        self.writer = csv.writer(self.f)
+        self.writer.writerow(columns)
+
+    def write(self, values: List):
+        self.writer.writerow(['' if v is None else v for v in values])
+
+    def close(self):
+        self.f.close()
+
+
+class JsonLinesWriter:
+    """Writes one compact JSON object per line (NDJSON) so consumers can stream the file."""
+    extension = 'jsonl'
+
+    def __init__(self, f, columns: List[str]):
+        self.columns = columns
+        self.f = f
+
+    def write(self, values: List):
+        self.f.write(json.dumps(dict(zip(self.columns, values)), ensure_ascii=False))
+        self.f.write('\n')
+
+    def close(self):
+        self.f.close()
+
+
+WRITERS = {
+    'json': JsonWriter,
+    'jsonl': JsonLinesWriter,
+    'csv': CsvWriter,
+}
+
+
+def export_paths(export_dir: Path, table_name: str, formats: Sequence[str], compress: bool) -> Dict[str, Path]:
+    suffix = '.gz' if compress else ''
+    return {fmt: export_dir / f"{table_name}.{WRITERS[fmt].extension}{suffix}" for fmt in formats}
+
+
+def open_export_file(path: Path, compress: bool):
+    if compress:
+        # mtime=0 keeps the gzip header, and so the file, identical across runs.
+        return io.TextIOWrapper(gzip.GzipFile(path, mode='wb', mtime=0), newline='', encoding='utf-8')
+    return open(path, 'w', newline='', encoding='utf-8')
+
+
 class DataExporter:
-    def __init__(self, reflector: SchemaReflector, export_dir: str = "./exports"):
+    def __init__(self, reflector: SchemaReflector, export_dir: str = "./exports", batch_size: Optional[int] = None,
+                 workers: Optional[int] = None, compress: bool = False, metrics: Optional[Metrics] = None):
         self.reflector = reflector
         self.engine: Engine = reflector.engine
         self.metadata = reflector.metadata
         self.export_dir = Path(export_dir)
         self.export_dir.mkdir(exist_ok=True)
+        self.batch_size = batch_size or Config.EXPORT_BATCH_SIZE
+        self.workers = workers or Config.EXPORT_WORKERS
+        self.compress = compress
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.row_counts: Dict[str, int] = {}
 
-    def export_table_to_json(self, table_name: str) -> str:
-        """Export a single table to JSON format."""
+    def _stream(self, conn, table_name: str):
+        """Execute ``SELECT *`` with a server-side cursor fetching ``batch_size`` rows at a time."""
         table = self.metadata.tables[table_name]
-        with self.engine.connect() as conn:
-            result = conn.execute(select(table))
-            rows = result.fetchall()
-            columns = result.keys()
-            
-            data = []
-            for row in rows:
-                row_dict = {}
-                for i, col in enumerate(columns):
-                    value = row[i]
-                    if hasattr(value, 'isoformat'):
-                        value = value.isoformat()
-                    elif isinstance(value, (bytes, bytearray)):
-                        value = value.decode('utf-8', errors='ignore')
-                    else:
-                        value = str(value) if value is not None else None
-                    row_dict[col] = value
-                data.append(row_dict)
-        
-        output_path = self.export_dir / f"{table_name}.json"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        query = select(table).order_by(*table.primary_key.columns)
+        return conn.execution_options(stream_results=True, yield_per=self.batch_size).execute(query)
+
+    def export_table(self, table_name: str, formats: Sequence[str] = ('json', 'csv')) -> Dict[str, str]:
+        """Scan a table once and feed every row to one writer per requested format."""
+        paths = export_paths(self.export_dir, table_name, formats, self.compress)
+        with self.metrics.stage('export', table_name) as record, self.engine.connect() as conn:
+            result = self._stream(conn, table_name)
+            columns = list(result.keys())
+            writers = [WRITERS[fmt](open_export_file(path, self.compress), columns) for fmt, path in paths.items()]
+            count = 0
+            try:
+                for row in result:
+                    values = [export_value(value) for value in row]
+                    for writer in writers:
+                        writer.write(values)
+                    count += 1
+            finally:
+                for writer in writers:
+                    writer.close()
+            record['rows'] = count
+        self.row_counts[table_name] = count
         
-        return str(output_path)
+        return {fmt: str(path) for fmt, path in paths.items()}
+
+    def export_table_to_json(self, table_name: str) -> str:
+        """Export a single table to JSON format."""
+        return self.export_table(table_name, ['json'])['json']
 
     def export_table_to_csv(self, table_name: str) -> str:
         """Export a single table to CSV format."""
-        table = self.metadata.tables[table_name]
-        with self.engine.connect() as conn:
-            result = conn.execute(select(table))
-            rows = result.fetchall()
-            columns = result.keys()
-            
-            output_path = self.export_dir / f"{table_name}.csv"
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(columns)
-                
-                for row in rows:
-                    processed_row = []
-                    for value in row:
-                        if hasattr(value, 'isoformat'):
-                            processed_row.append(value.isoformat())
-                        elif isinstance(value, (bytes, bytearray)):
-                            processed_row.append(value.decode('utf-8', errors='ignore'))
-                        else:
-                            processed_row.append(str(value) if value is not None else '')
-                    writer.writerow(processed_row)
-        
-        return str(output_path)
+        return self.export_table(table_name, ['csv'])['csv']
+
+    def export_all_tables(self, formats: Sequence[str] = ('json', 'csv'), workers: Optional[int] = None) -> Dict[str, Dict[str, str]]:
+        """Export all tables to every requested format with a single scan per table.
 
-    def export_all_tables(self) -> Dict[str, Dict[str, str]]:
-        """Export all tables to both JSON and CSV formats."""
+        With more than one worker, tables are exported concurrently on a thread pool
+        (one pooled connection each), largest first. Output files match a serial run.
+        """
         tables = self.reflector.get_all_tables()
+        workers = workers or self.workers
         results = {}
         
-        for table_name in tables:
-            print(f"Exporting {table_name}...")
-            json_path = self.export_table_to_json(table_name)
-            csv_path = self.export_table_to_csv(table_name)
-            results[table_name] = {
-                'json': json_path,
-                'csv': csv_path
-            }
+        if workers <= 1:
+            for table_name in tables:
+                print(f"Exporting {table_name}...")
+                results[table_name] = self.export_table(table_name, formats)
+            return results
+        
+        sizes = self.estimate_row_counts()
+        order = sorted(tables, key=lambda t: sizes.get(t, 0), reverse=True)
+        lock = threading.Lock()
+        
+        def run(table_name):
+            start = time.time()
+            paths = self.export_table(table_name, formats)
+            with lock:
+                results[table_name] = paths
+                print(f"Exported {table_name} ({len(results)}/{len(tables)}): "
+                      f"{self.row_counts[table_name]} rows in {time.time() - start:.2f}s")
+            return paths
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(run, t) for t in order]):
+                future.result()
         
-        return results
+        return {table_name: results[table_name] for table_name in tables}
 
-    def get_export_summary(self) -> Dict[str, int]:
-        """Get summary of exported data."""
-        summary = {}
+    def estimate_row_counts(self) -> Dict[str, int]:
+        """Approximate row counts: information_schema statistics on MySQL, COUNT(*) elsewhere."""
+        with self.engine.connect() as conn:
+            if self.engine.dialect.name == 'mysql':
+                rows = conn.execute(text(
+                    "SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()"
+                )).fetchall()
+                return {name: int(count or 0) for name, count in rows}
+            return {
+                table_name: conn.execute(select(func.count()).select_from(self.metadata.tables[table_name])).scalar()
+                for table_name in self.reflector.get_all_tables()
+            }
+
+    def get_export_summary(self, mode: str = 'recorded', recorded: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """Get row counts per table without re-reading the tables where possible.
+
+        ``recorded`` reuses counts captured while exporting (and any counts passed in, e.g.
+        from DataGenerator.row_counts); ``estimate`` uses information_schema statistics;
+        ``exact`` runs COUNT(*). Tables with no recorded count fall back to COUNT(*).
+        """
         tables = self.reflector.get_all_tables()
+        if mode == 'estimate':
+            known = self.estimate_row_counts()
+        elif mode == 'recorded':
+            known = {**(recorded or {}), **self.row_counts}
+        elif mode == 'exact':
+            known = {}
+        else:
+            raise ValueError(f"Unknown summary mode: {mode}")
         
+        summary = {}
         with self.engine.connect() as conn:
             for table_name in tables:
-                table = self.metadata.tables[table_name]
-                count = conn.execute(select(table)).rowcount
-                if count == -1:
-                    from sqlalchemy import func
-                    count = conn.execute(select(func.count()).select_from(table)).scalar()
-                summary[table_name] = count
+                if table_name in known:
+                    summary[table_name] = known[table_name]
+                else:
+                    table = self.metadata.tables[table_name]
+                    summary[table_name] = conn.execute(select(func.count()).select_from(table)).scalar()
         
         return summary
+
+
+class DirectExporter:
+    """Writes generated rows straight to export files, byte-identical to exporting them from the database.
+
+    Plugs into DataGenerator as its loader. Rows of surrogate-key tables arrive in key order and
+    are streamed; other tables (and any passed to hold()) are kept until close() and written
+    sorted by primary key. Numeric values are formatted to their column's scale, as the
+    database would return them.
+    """
+
+    def __init__(self, metadata: MetaData, export_dir: str = "./exports", formats: Sequence[str] = ('json', 'csv'),
+                 compress: bool = False):
+        self.metadata = metadata
+        self.export_dir = Path(export_dir)
+        self.export_dir.mkdir(exist_ok=True)
+        self.formats = list(formats)
+        self.compress = compress
+        keys = KeyRegistry(metadata)
+        self.held: Dict[str, List[dict]] = {
+            name: [] for name in metadata.tables if keys.key_column(name) is None
+        }
+        self.row_counts: Dict[str, int] = {}
+        self.paths: Dict[str, Dict[str, str]] = {}
+        self._writers: Dict[str, list] = {}
+
+    def hold(self, table_name: str) -> List[dict]:
+        """Keep a table's rows in memory until close() so they can still be updated; returns the list."""
+        return self.held.setdefault(table_name, [])
+
+    def load(self, conn, table: Table, rows: List[dict]):
+        if table.name in self.held:
+            self.held[table.name].extend(rows)
+        else:
+            self._write(table, rows)
+
+    def _write(self, table: Table, rows: List[dict]):
+        writers = self._writers.get(table.name)
+        if writers is None:
+            columns = [c.name for c in table.columns]
+            paths = export_paths(self.export_dir, table.name, self.formats, self.compress)
+            writers = self._writers[table.name] = [
+                WRITERS[fmt](open_export_file(path, self.compress), columns) for fmt, path in paths.items()
+            ]
+            self.paths[table.name] = {fmt: str(path) for fmt, path in paths.items()}
+            self.row_counts[table.name] = 0
+        converters = [(c.name, self._converter(c)) for c in table.columns]
+        for row in rows:
+            values = [None if (value := row.get(name)) is None else convert(value) for name, convert in converters]
+            for writer in writers:
+                writer.write(values)
+        self.row_counts[table.name] += len(rows)
+
+    @staticmethod
+    def _converter(column):
+        """Function turning a non-NULL generated value into its export string, as read back from the database."""
+        column_type = column.type
+        if isinstance(column_type, Numeric) and column_type.asdecimal and column_type.scale is not None:
+            quantum = Decimal(1).scaleb(-column_type.scale)
+            return lambda v: str(Decimal(str(v)).quantize(quantum, ROUND_HALF_UP))
+        if isinstance(column_type, (Integer, String)):
+            return str
+        if isinstance(column_type, Date):
+            return lambda v: v.isoformat()
+        return export_value
+
+    def close(self) -> Dict[str, Dict[str, str]]:
+        """Write held tables, create files for tables that got no rows and close everything."""
+        for table_name, rows in self.held.items():
+            table = self.metadata.tables[table_name]
+            pk_names = [c.name for c in table.primary_key.columns]
+            rows.sort(key=lambda row: tuple(row[name] for name in pk_names))
+            self._write(table, rows)
+        for table in self.metadata.tables.values():
+            if table.name not in self._writers:
+                self._write(table, [])
+        for writers in self._writers.values():
+            for writer in writers:
+                writer.close()
+        return {name: self.paths[name] for name in self.metadata.tables}
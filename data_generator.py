@@ -1,14 +1,23 @@
 from __future__ import annotations
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import date, timedelta
 import random
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
 
-from sqlalchemy import create_engine, MetaData, Table, select, insert, text
+import numpy as np
+from sqlalchemy import create_engine, MetaData, Table, select, text, case
 from sqlalchemy.engine import Engine
+from sqlalchemy.schema import AddConstraint, DropConstraint
 from sqlalchemy.orm import sessionmaker
 
+from bulk_loader import get_loader
 from config import Config
+from counter_rng import CounterRows
+from key_registry import KeyRegistry
+from metrics import Metrics
+from value_pool import ValuePools
 from schema_reflector import SchemaReflector
 from utils import (
     get_faker,
@@ -20,32 +29,142 @@ from utils import (
     dob_for_age,
     random_phone,
     random_cc_number,
+    get_rng,
+    past_dates,
+    future_dates,
+    money,
+    rows_from_columns,
+    chunked,
+    derive_seed,
+    preserved_random_state,
 )
 
 
 class DataGenerator:
-    def __init__(self, database_url: str | None = None, seed: int | None = None):
-        self.database_url = database_url or Config.get_database_url()
+    # Parents per vectorized block; fixed so streamed output does not depend on CHUNK_SIZE.
+    VECTOR_BLOCK = 1024
+    RESET_MODES = ('delete', 'truncate', 'recreate')
+
+    def __init__(self, database_url: str | None = None, seed: int | None = None, vectorized: bool | None = None,
+                 sharded: bool | None = None, workers: int | None = None, metadata: MetaData | None = None,
+                 reflector: SchemaReflector | None = None, load_mode: str | None = None,
+                 metrics: Metrics | None = None, counter_rng: bool | None = None):
+        self.database_url = database_url or (reflector.database_url if reflector else Config.get_database_url())
         self.seed = seed if seed is not None else Config.RANDOM_SEED
+        self.vectorized = vectorized if vectorized is not None else Config.VECTORIZED
+        self.sharded = sharded if sharded is not None else Config.SHARDED
+        self.workers = workers or Config.GENERATION_WORKERS
+        self.shard_size = Config.SHARD_SIZE
+        self.load_mode = load_mode or Config.LOAD_MODE
         self.fake = get_faker(self.seed)
-        self.reflector = SchemaReflector(self.database_url)
-        self.metadata = MetaData()
-        self.engine: Engine = self.reflector.engine
-        self.metadata.reflect(bind=self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+        self.rng = get_rng(self.seed)
+        self.pools = ValuePools(self.seed) if Config.VALUE_POOLS else None
+        if metadata is None:
+            self.reflector = reflector or SchemaReflector(self.database_url, load_mode=self.load_mode)
+            self.metadata = self.reflector.reflect_schema()
+            self.engine: Engine = self.reflector.engine
+            self.Session = sessionmaker(bind=self.engine)
+        else:
+            # Generation-only instance (e.g. a shard worker): no database connection.
+            self.reflector = None
+            self.metadata = metadata
+            self.engine = None
+            self.Session = None
         self._table_objs: Dict[str, Table] = {t.name: t for t in self.metadata.sorted_tables}
+        self.counter_rng = counter_rng if counter_rng is not None else Config.COUNTER_RNG
+        self.counter = CounterRows(self.seed, self.metadata, self.pools) if self.counter_rng else None
+        self.row_counts: Dict[str, int] = defaultdict(int)
+        self.commits = 0
+        self._uncommitted = 0
+        self.timings: Dict[str, float] = {}
+        self.metrics = metrics if metrics is not None else Metrics()
+        self._deferred = None
 
     def table(self, name: str) -> Table:
         return self._table_objs[name]
 
-    def truncate_all(self):
-        with self.engine.begin() as conn:
-            conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
-            order = self.reflector.get_table_dependencies()
-            for tname in reversed(order):
-                if tname in self._table_objs:
+    def truncate_all(self, mode: str | None = None, defer_indexes: bool | None = None) -> Dict[str, float]:
+        """Empty every table and return seconds per phase (also kept in ``self.timings``).
+
+        ``delete`` removes rows child tables first; ``truncate`` uses TRUNCATE and ``recreate``
+        drops and recreates the tables from the reflected DDL, both resetting auto-increment
+        counters. With ``defer_indexes``, secondary indexes and foreign keys stay dropped until
+        generate_and_insert_all has loaded the data.
+        """
+        mode = mode or Config.RESET_MODE
+        if mode not in self.RESET_MODES:
+            raise ValueError(f"Unknown reset mode: {mode}")
+        defer_indexes = defer_indexes if defer_indexes is not None else Config.DEFER_INDEXES
+        self.timings = {}
+        order = [t for t in reversed(self.reflector.get_table_dependencies()) if t in self._table_objs]
+        with self.metrics.stage('generate', 'reset'), self.engine.begin() as conn:
+            self._set_foreign_key_checks(conn, False)
+            if mode == 'recreate':
+                tables = [self.table(tname) for tname in order]
+                self.metadata.drop_all(conn, tables=tables)
+                self.metadata.create_all(conn, tables=tables)
+            elif mode == 'truncate':
+                self._truncate_tables(conn, order)
+            else:
+                for tname in order:
                     conn.execute(self.table(tname).delete())
-            conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+            self._set_foreign_key_checks(conn, True)
+        if mode == 'recreate':
+            # The recreated DDL need not match the original text (or fingerprint) exactly.
+            self.reflector.invalidate()
+        self.timings['reset'] = self.metrics.seconds('generate', 'reset')
+        if defer_indexes:
+            with self.metrics.stage('generate', 'drop_indexes'):
+                self.drop_secondary_indexes()
+            self.timings['drop_indexes'] = self.metrics.seconds('generate', 'drop_indexes')
+        return self.timings
+
+    def _set_foreign_key_checks(self, conn, enabled: bool):
+        if self.engine.dialect.name == 'mysql':
+            conn.execute(text(f"SET FOREIGN_KEY_CHECKS = {int(enabled)}"))
+
+    def _truncate_tables(self, conn, order: List[str]):
+        quote = self.engine.dialect.identifier_preparer.quote
+        if self.engine.dialect.name != 'sqlite':
+            for tname in order:
+                conn.execute(text(f"TRUNCATE TABLE {quote(tname)}"))
+            return
+        # SQLite has no TRUNCATE: an unqualified DELETE takes its truncate optimization,
+        # and AUTOINCREMENT counters live in sqlite_sequence.
+        for tname in order:
+            conn.execute(self.table(tname).delete())
+        if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'")).first():
+            for tname in order:
+                conn.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {'name': tname})
+
+    def drop_secondary_indexes(self):
+        """Drop non-unique indexes and named foreign keys before a bulk load; see restore_secondary_indexes."""
+        indexes, fks = [], []
+        with self.engine.begin() as conn:
+            # SQLite cannot alter constraints (and does not enforce them by default).
+            if self.engine.dialect.name != 'sqlite':
+                for table in self.metadata.sorted_tables:
+                    for fk in table.foreign_key_constraints:
+                        if fk.name:
+                            conn.execute(DropConstraint(fk))
+                            fks.append(fk)
+            for table in self.metadata.sorted_tables:
+                for index in table.indexes:
+                    if not index.unique:
+                        index.drop(conn)
+                        indexes.append(index)
+        self._deferred = (indexes, fks)
+
+    def restore_secondary_indexes(self):
+        """Recreate what drop_secondary_indexes removed: indexes first, then the foreign keys."""
+        indexes, fks = self._deferred
+        self._deferred = None
+        with self.engine.begin() as conn:
+            for index in indexes:
+                index.create(conn)
+            for fk in fks:
+                conn.execute(AddConstraint(fk))
+        self.reflector.invalidate()
 
     def _string_len(self, table: Table, col_name: str):
         col = table.c[col_name]
@@ -54,6 +173,18 @@ class DataGenerator:
         except Exception:
             return None
 
+    def _fake_text(self, table: Table, col_name: str, field: str, **kwargs) -> str:
+        max_len = self._string_len(table, col_name)
+        if self.pools is not None:
+            return self.pools.get(field, max_len, **kwargs).draw()
+        return ensure_max_length(getattr(self.fake, field)(**kwargs), max_len)
+
+    def _fake_text_column(self, table: Table, col_name: str, field: str, n: int, **kwargs) -> np.ndarray:
+        max_len = self._string_len(table, col_name)
+        if self.pools is not None:
+            return self.pools.get(field, max_len, **kwargs).sample(self.rng, n)
+        return np.asarray([ensure_max_length(getattr(self.fake, field)(**kwargs), max_len) for _ in range(n)], dtype=object)
+
     def generate_account_type(self) -> List[dict]:
         t = self.table('account_type')
         rows = []
@@ -73,8 +204,8 @@ class DataGenerator:
         t = self.table('branches')
         rows = []
         for _ in range(n):
-            street = ensure_max_length(self.fake.street_address(), self._string_len(t, 'Street_Address'))
-            city = ensure_max_length(self.fake.city(), self._string_len(t, 'City'))
+            street = self._fake_text(t, 'Street_Address', 'street_address')
+            city = self._fake_text(t, 'City', 'city')
             state = ensure_max_length(random_state_us(self.fake), self._string_len(t, 'State'))
             phone = ensure_max_length(random_phone(self.fake), self._string_len(t, 'Phone_Number'))
             rows.append({
@@ -92,8 +223,8 @@ class DataGenerator:
         rows = []
         emails = set()
         for _ in range(n):
-            first = ensure_max_length(self.fake.first_name(), self._string_len(t, 'First_Name'))
-            last = ensure_max_length(self.fake.last_name(), self._string_len(t, 'Last_Name'))
+            first = self._fake_text(t, 'First_Name', 'first_name')
+            last = self._fake_text(t, 'Last_Name', 'last_name')
             dob = dob_for_age(self.fake, 18, 90)
             email = self.fake.unique.email()
             email = ensure_max_length(email, self._string_len(t, 'Email'))
@@ -104,8 +235,8 @@ class DataGenerator:
                 'First_Name': first,
                 'Last_Name': last,
                 'Date_of_Birth': dob,
-                'Street_Address': ensure_max_length(self.fake.street_address(), self._string_len(t, 'Street_Address')),
-                'City': ensure_max_length(self.fake.city(), self._string_len(t, 'City')),
+                'Street_Address': self._fake_text(t, 'Street_Address', 'street_address'),
+                'City': self._fake_text(t, 'City', 'city'),
                 'State': ensure_max_length(random_state_us(self.fake), self._string_len(t, 'State')),
                 'Zipcode': int(self.fake.postcode().split('-')[0][:5] or 10000),
                 'Email': email,
@@ -118,13 +249,13 @@ class DataGenerator:
         rows = []
         for _ in range(n):
             rows.append({
-                'First_Name': ensure_max_length(self.fake.first_name(), self._string_len(t, 'First_Name')),
-                'Last_Name': ensure_max_length(self.fake.last_name(), self._string_len(t, 'Last_Name')),
+                'First_Name': self._fake_text(t, 'First_Name', 'first_name'),
+                'Last_Name': self._fake_text(t, 'Last_Name', 'last_name'),
                 'Supervisor_id': None,  # fill later probabilistically
                 'Level_of_Access': ensure_max_length(random.choice(['Teller', 'Manager', 'Analyst', 'Clerk']), self._string_len(t, 'Level_of_Access')),
                 'Date_of_Birth': dob_for_age(self.fake, 21, 70),
-                'Street_Address': ensure_max_length(self.fake.street_address(), self._string_len(t, 'Street_Address')),
-                'City': ensure_max_length(self.fake.city(), self._string_len(t, 'City')),
+                'Street_Address': self._fake_text(t, 'Street_Address', 'street_address'),
+                'City': self._fake_text(t, 'City', 'city'),
                 'State': ensure_max_length(random_state_us(self.fake), self._string_len(t, 'State')),
                 'Zipcode': int(self.fake.postcode().split('-')[0][:5] or 10000),
                 'Sex': ensure_max_length(random_sex(), self._string_len(t, 'Sex')),
@@ -146,6 +277,21 @@ class DataGenerator:
             })
         return rows
 
+    def generate_accounts_columns(self, n: int, branch_ids: List[int], account_types: List[str]) -> Dict[str, np.ndarray]:
+        return {
+            'Account_Balance': money(self.rng.uniform(0, 50000, size=n)),
+            'Branch_id': self.rng.choice(np.asarray(branch_ids), size=n),
+            'Date_Opened': past_dates(self.rng, n, 0, 20),
+            'Account_Type': self.rng.choice(np.asarray(account_types, dtype=object), size=n),
+        }
+
+    def _account_rows(self, n: int, branch_ids: List[int], account_types: List[str], min_map: Dict[str, float]) -> List[dict]:
+        if self.vectorized:
+            accounts = rows_from_columns(self.generate_accounts_columns(n, branch_ids, account_types))
+        else:
+            accounts = self.generate_accounts(n, branch_ids, account_types)
+        return self.apply_minimum_balances(accounts, min_map)
+
     def generate_account_customers(self, account_ids: List[int], customer_ids: List[int]) -> List[dict]:
         t = self.table('account_customers')
         rows = []
@@ -160,21 +306,44 @@ class DataGenerator:
         return rows
 
     def generate_banking_transactions(self, customer_ids_with_account: List[int]) -> List[dict]:
+        return list(self._banking_transaction_rows(customer_ids_with_account))
+
+    def iter_banking_transactions(self, customer_ids_with_account: List[int], chunk_size: int | None = None) -> Iterator[List[dict]]:
+        if self.vectorized:
+            rows = (row for block in chunked(customer_ids_with_account, self.VECTOR_BLOCK)
+                    for row in rows_from_columns(self.generate_banking_transactions_columns(block)))
+        else:
+            rows = self._banking_transaction_rows(customer_ids_with_account)
+        return chunked(rows, chunk_size or Config.CHUNK_SIZE)
+
+    def _banking_transaction_rows(self, customer_ids_with_account: List[int]) -> Iterator[dict]:
         t = self.table('banking_transactions')
-        rows = []
         tx_types = ['Deposit', 'Withdrawal', 'Transfer', 'Payment']
         for cust_id in customer_ids_with_account:
             for _ in range(random.randint(5, 20)):
                 amount = round(random.uniform(1, 2500), 2)
                 tx_date = past_date(self.fake, 0, 10)
-                rows.append({
+                yield {
                     'Transaction_Type': ensure_max_length(random.choice(tx_types), self._string_len(t, 'Transaction_Type')),
-                    'Description': ensure_max_length(self.fake.sentence(nb_words=4), self._string_len(t, 'Description')),
+                    'Description': self._fake_text(t, 'Description', 'sentence', nb_words=4),
                     'Amount': amount,
                     'Transaction_Date': tx_date,
                     'Customer_id': cust_id,
-                })
-        return rows
+                }
+
+    def generate_banking_transactions_columns(self, customer_ids_with_account: List[int]) -> Dict[str, np.ndarray]:
+        t = self.table('banking_transactions')
+        tx_types = np.asarray([ensure_max_length(x, self._string_len(t, 'Transaction_Type'))
+                               for x in ['Deposit', 'Withdrawal', 'Transfer', 'Payment']], dtype=object)
+        counts = self.rng.integers(5, 20, size=len(customer_ids_with_account), endpoint=True)
+        n = int(counts.sum())
+        return {
+            'Transaction_Type': self.rng.choice(tx_types, size=n),
+            'Description': self._fake_text_column(t, 'Description', 'sentence', n, nb_words=4),
+            'Amount': money(self.rng.uniform(1, 2500, size=n)),
+            'Transaction_Date': past_dates(self.rng, n, 0, 10),
+            'Customer_id': np.repeat(np.asarray(customer_ids_with_account, dtype=np.int64), counts),
+        }
 
     def generate_credit_cards(self, customer_ids: List[int]) -> List[dict]:
         t = self.table('credit_cards')
@@ -195,9 +364,44 @@ class DataGenerator:
                 })
         return rows
 
+    def generate_credit_cards_columns(self, customer_ids: List[int]) -> Dict[str, np.ndarray]:
+        t = self.table('credit_cards')
+        holders = np.asarray(customer_ids, dtype=np.int64)[self.rng.random(len(customer_ids)) < 0.6]
+        n = len(holders)
+        numbers = self.rng.integers(0, 10 ** 16, size=n)
+        while True:
+            duplicate = np.ones(n, dtype=bool)
+            duplicate[np.unique(numbers, return_index=True)[1]] = False
+            if not duplicate.any():
+                break
+            numbers[duplicate] = self.rng.integers(0, 10 ** 16, size=int(duplicate.sum()))
+        max_len = self._string_len(t, 'CC_number')
+        return {
+            'CC_number': np.asarray([ensure_max_length(f"{x:016d}", max_len) for x in numbers.tolist()], dtype=object),
+            'Maximum_Limit': money(self.rng.uniform(1000, 20000, size=n)),
+            'Expiry_Date': future_dates(self.rng, n, 1, 5),
+            'Credit_Score': self.rng.integers(300, 850, size=n, endpoint=True),
+            'Customer_id': holders,
+        }
+
+    def _credit_card_rows(self, customer_ids: List[int]) -> List[dict]:
+        if self.vectorized:
+            return rows_from_columns(self.generate_credit_cards_columns(customer_ids))
+        return self.generate_credit_cards(customer_ids)
+
     def generate_cc_transactions(self, cards: List[dict]) -> List[dict]:
+        return list(self._cc_transaction_rows(cards))
+
+    def iter_cc_transactions(self, cards: List[dict], chunk_size: int | None = None) -> Iterator[List[dict]]:
+        if self.vectorized:
+            rows = (row for block in chunked(cards, self.VECTOR_BLOCK)
+                    for row in rows_from_columns(self.generate_cc_transactions_columns(block)))
+        else:
+            rows = self._cc_transaction_rows(cards)
+        return chunked(rows, chunk_size or Config.CHUNK_SIZE)
+
+    def _cc_transaction_rows(self, cards: List[dict]) -> Iterator[dict]:
         t = self.table('cc_transactions')
-        rows = []
         for card in cards:
             cc_number = card['CC_number']
             expiry = card['Expiry_Date']
@@ -205,13 +409,27 @@ class DataGenerator:
                 tx_date = past_date(self.fake, 0, 5)
                 if tx_date > expiry:
                     tx_date = expiry - timedelta(days=random.randint(1, 365))
-                rows.append({
+                yield {
                     'CC_Number': cc_number,
                     'Transaction_Date': tx_date,
                     'Amount': round(random.uniform(1, 2500), 2),
-                    'Merchant_Details': ensure_max_length(self.fake.company(), self._string_len(t, 'Merchant_Details')),
-                })
-        return rows
+                    'Merchant_Details': self._fake_text(t, 'Merchant_Details', 'company'),
+                }
+
+    def generate_cc_transactions_columns(self, cards: List[dict]) -> Dict[str, np.ndarray]:
+        t = self.table('cc_transactions')
+        counts = self.rng.integers(5, 30, size=len(cards), endpoint=True)
+        n = int(counts.sum())
+        expiry = np.repeat(np.asarray([c['Expiry_Date'] for c in cards], dtype='datetime64[D]'), counts)
+        tx_date = past_dates(self.rng, n, 0, 5)
+        late = tx_date > expiry
+        tx_date[late] = expiry[late] - self.rng.integers(1, 365, size=int(late.sum()), endpoint=True).astype('timedelta64[D]')
+        return {
+            'CC_Number': np.repeat(np.asarray([c['CC_number'] for c in cards], dtype=object), counts),
+            'Transaction_Date': tx_date,
+            'Amount': money(self.rng.uniform(1, 2500, size=n)),
+            'Merchant_Details': self._fake_text_column(t, 'Merchant_Details', 'company', n),
+        }
 
     def generate_loans(self, customer_ids: List[int]) -> List[dict]:
         t = self.table('loan')
@@ -233,6 +451,28 @@ class DataGenerator:
                 })
         return rows
 
+    def generate_loans_columns(self, customer_ids: List[int]) -> Dict[str, np.ndarray]:
+        t = self.table('loan')
+        borrowers = np.asarray(customer_ids, dtype=np.int64)[self.rng.random(len(customer_ids)) < 0.35]
+        n = len(borrowers)
+        amount_taken = money(self.rng.uniform(2000, 100000, size=n))
+        loan_types = np.asarray([ensure_max_length(x, self._string_len(t, 'Loan_Type'))
+                                 for x in ['Home', 'Auto', 'Personal', 'Student']], dtype=object)
+        return {
+            'Duration_in_Years': money(self.rng.uniform(0.5, 30.0, size=n)),
+            'Loan_Start_Date': past_dates(self.rng, n, 0, 15),
+            'Interest_Rate': money(self.rng.uniform(2.5, 18.0, size=n)),
+            'Loan_Amount_Taken': amount_taken,
+            'Loan_Amount_Repaid': money(self.rng.uniform(0, amount_taken)),
+            'Loan_Type': self.rng.choice(loan_types, size=n),
+            'Customer_id': borrowers,
+        }
+
+    def _loan_rows(self, customer_ids: List[int]) -> List[dict]:
+        if self.vectorized:
+            return rows_from_columns(self.generate_loans_columns(customer_ids))
+        return self.generate_loans(customer_ids)
+
     def generate_branch_employees(self, branch_ids: List[int], employee_ids: List[int]) -> List[dict]:
         t = self.table('branch_employees')
         rows = []
@@ -254,63 +494,330 @@ class DataGenerator:
                 pairs.add(key)
         return rows
 
-    def enforce_business_rules(self, conn):
+    def apply_minimum_balances(self, accounts: List[dict], min_map: Dict[str, float]) -> List[dict]:
+        for row in accounts:
+            min_req = min_map.get(row['Account_Type'], 0.0)
+            if float(row['Account_Balance']) < min_req:
+                row['Account_Balance'] = round(random.uniform(min_req, max(min_req + 1000, min_req + 1)), 2)
+        return accounts
+
+    def assign_supervisors(self, employee_ids: List[int]) -> Dict[int, int]:
+        if self.counter is not None:
+            return self.counter.supervisors(employee_ids)
+        assignments = {}
+        for e in employee_ids:
+            if random.random() < 0.6:
+                sup = random.choice(employee_ids)
+                if sup != e:
+                    assignments[e] = sup
+        return assignments
+
+    def enforce_business_rules(self, conn, employee_ids: List[int] | None = None):
         at = self.table('account_type')
         ac = self.table('accounts')
-        res = conn.execute(select(at.c.Account_Type, at.c.Minimum_Balance_Restriction))
-        min_map = {r[0]: float(r[1]) for r in res.fetchall()}
-        res2 = conn.execute(select(ac.c.Account_id, ac.c.Account_Type, ac.c.Account_Balance))
-        for acc_id, atype, bal in res2.fetchall():
-            min_req = min_map.get(atype, 0.0)
-            if float(bal) < min_req:
-                new_bal = round(random.uniform(min_req, max(min_req + 1000, min_req + 1)), 2)
-                conn.execute(ac.update().where(ac.c.Account_id == acc_id).values(Account_Balance=new_bal))
+        # Safety net for rows that bypassed apply_minimum_balances: one correlated UPDATE.
+        min_bal = select(at.c.Minimum_Balance_Restriction).where(
+            at.c.Account_Type == ac.c.Account_Type
+        ).scalar_subquery()
+        conn.execute(ac.update().where(ac.c.Account_Balance < min_bal).values(Account_Balance=min_bal))
         emp = self.table('employees')
-        ids = [row[0] for row in conn.execute(select(emp.c.Employee_id)).fetchall()]
-        for e in ids:
-            if random.random() < 0.6:
-                sup = random.choice(ids)
-                if sup != e:
-                    conn.execute(emp.update().where(emp.c.Employee_id == e).values(Supervisor_id=sup))
+        if employee_ids is None:
+            employee_ids = [row[0] for row in conn.execute(select(emp.c.Employee_id)).fetchall()]
+        assignments = list(self.assign_supervisors(employee_ids).items())
+        for chunk in chunked(assignments, Config.CHUNK_SIZE):
+            mapping = dict(chunk)
+            conn.execute(
+                emp.update()
+                .where(emp.c.Employee_id.in_(list(mapping)))
+                .values(Supervisor_id=case(mapping, value=emp.c.Employee_id))
+            )
+
+    def run_shard(self, kind: str, seed: int, args: tuple):
+        """Generate one shard with its own seed; the result depends only on (kind, seed, args)."""
+        self.fake = get_faker(seed)
+        self.rng = get_rng(seed)
+        if kind == 'customers':
+            return self.generate_customers(*args)
+        if kind == 'accounts':
+            return self._account_rows(*args)
+        if kind == 'banking_transactions':
+            return [row for chunk in self.iter_banking_transactions(*args) for row in chunk]
+        if kind == 'credit_cards':
+            cards = self._credit_card_rows(*args)
+            return cards, [row for chunk in self.iter_cc_transactions(cards) for row in chunk]
+        if kind == 'loan':
+            return self._loan_rows(*args)
+        raise ValueError(f"Unknown shard kind: {kind}")
+
+    def iter_shards(self, kind: str, shard_args: List[tuple]) -> Iterator:
+        """Yield shard results in shard order, whatever the number of workers."""
+        tasks = [(kind, derive_seed(self.seed, kind, i), args) for i, args in enumerate(shard_args)]
+        if self.workers <= 1:
+            with preserved_random_state():
+                gen = DataGenerator(seed=self.seed, vectorized=self.vectorized, metadata=self.metadata)
+            for task in tasks:
+                with preserved_random_state():
+                    result = gen.run_shard(*task)
+                yield result
+            return
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_shard_worker,
+                                 initargs=(self.seed, self.metadata, self.vectorized)) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(_run_shard_task, task))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _split_count(self, n: int) -> List[tuple]:
+        return [(min(self.shard_size, n - start),) for start in range(0, n, self.shard_size)]
+
+    def _split_ids(self, ids: List) -> List[tuple]:
+        return [(ids[start:start + self.shard_size],) for start in range(0, len(ids), self.shard_size)]
+
+    def _dedupe_emails(self, rows: List[dict], seen: set):
+        max_len = self._string_len(self.table('customers'), 'Email') or 255
+        for row in rows:
+            local, _, domain = row['Email'].partition('@')
+            email, attempt = row['Email'], 0
+            while email in seen:
+                attempt += 1
+                suffix = str(attempt)
+                email = f"{local[:max_len - len(domain) - len(suffix) - 1]}{suffix}@{domain}"
+            row['Email'] = email
+            seen.add(email)
+
+    def _dedupe_cards(self, cards: List[dict], seen: set) -> Dict[str, str]:
+        remap = {}
+        for card in cards:
+            number, attempt = card['CC_number'], 0
+            while number in seen:
+                attempt += 1
+                number = f"{(int(card['CC_number']) + attempt) % 10 ** 16:016d}"
+            if number != card['CC_number']:
+                remap[card['CC_number']] = number
+                card['CC_number'] = number
+            seen.add(number)
+        return remap
+
+    def _insert_rows(self, conn, table: Table, rows: List[dict]) -> List[int]:
+        """Assign client-side keys to ``rows``, insert them in batches and return the keys.
+
+        Tables are loaded parents first, so committing between batches never leaves a
+        committed child row without its parent.
+        """
+        if not rows:
+            return []
+        ids = self.keys.assign(table.name, rows)
+        interval = Config.commit_interval(table.name)
+        for batch in chunked(rows, Config.batch_size(table.name) or len(rows)):
+            self.loader.load(conn, table, batch)
+            self.row_counts[table.name] += len(batch)
+            self._uncommitted += len(batch)
+            if interval and conn is not None and self._uncommitted >= interval:
+                conn.commit()
+                self._uncommitted = 0
+                self.commits += 1
+        return ids
+
+    def _insert_chunks(self, conn, table: Table, chunks: Iterable[List[dict]], collect_ids: bool = False) -> List[int]:
+        """Insert every chunk; returns the assigned keys only with ``collect_ids`` (for parents of later tables).
+
+        Leaf tables such as the transaction tables leave it off, so memory stays bounded by one chunk.
+        """
+        ids = []
+        for chunk in chunks:
+            chunk_ids = self._insert_rows(conn, table, chunk)
+            if collect_ids:
+                ids.extend(chunk_ids)
+        return ids
 
     def generate_and_insert_all(self):
-        with self.engine.begin() as conn:
-            if 'account_type' in self._table_objs:
+        """Generate and load every table; per-table wall/CPU time, rows and peak RSS go to ``self.metrics``."""
+        try:
+            with self.metrics.stage('generate', 'load') as record:
+                self._load_all()
+                record['rows'] = sum(self.row_counts.values())
+        finally:
+            self.timings['load'] = self.metrics.seconds('generate', 'load')
+            if self._deferred is not None:
+                with self.metrics.stage('generate', 'rebuild_indexes'):
+                    self.restore_secondary_indexes()
+                self.timings['rebuild_indexes'] = self.metrics.seconds('generate', 'rebuild_indexes')
+        return True
+
+    def _load_all(self):
+        with self.engine.connect() as conn:
+            self.keys = KeyRegistry(self.metadata, conn)
+            self.loader = get_loader(self.load_mode, self.engine.dialect.name)
+            employee_ids = self._load_tables(conn)
+            with self.metrics.stage('generate', 'business_rules'):
+                self.enforce_business_rules(conn, employee_ids)
+                conn.commit()
+            self.commits += 1
+
+    def generate_to_files(self, exporter) -> Dict[str, Dict[str, str]]:
+        """Database-free run: feed every table to a DirectExporter and return its file paths.
+
+        The rows, keys and random sequence are those of generate_and_insert_all, so the files
+        match an export of a freshly generated database for the same seed.
+        """
+        self.keys = KeyRegistry(self.metadata)
+        self.loader = exporter
+        # Supervisors are assigned after everything else is generated (see enforce_business_rules).
+        employees = exporter.hold('employees') if 'employees' in self._table_objs else []
+        employee_ids = self._load_tables(None)
+        assignments = self.assign_supervisors(employee_ids)
+        for row in employees:
+            row['Supervisor_id'] = assignments.get(row['Employee_id'], row.get('Supervisor_id'))
+        return exporter.close()
+
+    @contextmanager
+    def _measure_tables(self, *names: str):
+        """Record a 'generate' metrics stage for ``names``; its rows are those loaded into them meanwhile."""
+        before = sum(self.row_counts.get(name, 0) for name in names)
+        with self.metrics.stage('generate', '+'.join(names)) as record:
+            yield
+            record['rows'] = sum(self.row_counts.get(name, 0) for name in names) - before
+
+    def _load_tables(self, conn) -> List[int]:
+        """Generate and load every table, parents first; returns the employee ids."""
+        self.row_counts = defaultdict(int)
+        self._uncommitted = 0
+        self.commits = 0
+        if self.counter is not None:
+            return self._load_counter_tables(conn)
+        min_map = {}
+        if 'account_type' in self._table_objs:
+            with self._measure_tables('account_type'):
                 types = self.generate_account_type()
-                if types:
-                    conn.execute(insert(self.table('account_type')), types)
-            branches = self.generate_branches(Config.NUM_BRANCHES)
-            result = conn.execute(insert(self.table('branches')), branches)
-            branch_ids = [row[0] for row in conn.execute(select(self.table('branches').c.Branch_id)).fetchall()]
-            customers = self.generate_customers(Config.NUM_CUSTOMERS)
-            conn.execute(insert(self.table('customers')), customers)
-            customer_ids = [row[0] for row in conn.execute(select(self.table('customers').c.Customer_id)).fetchall()]
-            employees = self.generate_employees(Config.NUM_EMPLOYEES)
-            conn.execute(insert(self.table('employees')), employees)
-            employee_ids = [row[0] for row in conn.execute(select(self.table('employees').c.Employee_id)).fetchall()]
-            atypes = [r[0] for r in conn.execute(select(self.table('account_type').c.Account_Type)).fetchall()]
-            accounts = self.generate_accounts(Config.NUM_ACCOUNTS, branch_ids, atypes)
-            conn.execute(insert(self.table('accounts')), accounts)
-            account_ids = [row[0] for row in conn.execute(select(self.table('accounts').c.Account_id)).fetchall()]
+                self._insert_rows(conn, self.table('account_type'), types)
+            min_map = {r['Account_Type']: r['Minimum_Balance_Restriction'] for r in types}
+        atypes = list(min_map)
+        with self._measure_tables('branches'):
+            branch_ids = self._insert_rows(conn, self.table('branches'), self.generate_branches(Config.NUM_BRANCHES))
+        with self._measure_tables('customers'):
+            if self.sharded:
+                emails = set()
+                customer_ids = []
+                for shard_rows in self.iter_shards('customers', self._split_count(Config.NUM_CUSTOMERS)):
+                    self._dedupe_emails(shard_rows, emails)
+                    customer_ids.extend(self._insert_rows(conn, self.table('customers'), shard_rows))
+            else:
+                customers = self.generate_customers(Config.NUM_CUSTOMERS)
+                customer_ids = self._insert_rows(conn, self.table('customers'), customers)
+        with self._measure_tables('employees'):
+            employee_ids = self._insert_rows(conn, self.table('employees'), self.generate_employees(Config.NUM_EMPLOYEES))
+        with self._measure_tables('accounts'):
+            if self.sharded:
+                shard_args = [(n, branch_ids, atypes, min_map) for (n,) in self._split_count(Config.NUM_ACCOUNTS)]
+                account_ids = self._insert_chunks(conn, self.table('accounts'), self.iter_shards('accounts', shard_args),
+                                                  collect_ids=True)
+            else:
+                accounts = self._account_rows(Config.NUM_ACCOUNTS, branch_ids, atypes, min_map)
+                account_ids = self._insert_rows(conn, self.table('accounts'), accounts)
+        with self._measure_tables('account_customers'):
             ac_rows = self.generate_account_customers(account_ids, customer_ids)
-            if ac_rows:
-                conn.execute(insert(self.table('account_customers')), ac_rows)
-            customers_with_accounts = list({r['Customer_id'] for r in ac_rows})
-            bt_rows = self.generate_banking_transactions(customers_with_accounts)
-            if bt_rows:
-                conn.execute(insert(self.table('banking_transactions')), bt_rows)
-            cc_rows = self.generate_credit_cards(customer_ids)
-            if cc_rows:
-                conn.execute(insert(self.table('credit_cards')), cc_rows)
-            cc_tx_rows = self.generate_cc_transactions(cc_rows)
-            if cc_tx_rows:
-                conn.execute(insert(self.table('cc_transactions')), cc_tx_rows)
-            loan_rows = self.generate_loans(customer_ids)
-            if loan_rows:
-                conn.execute(insert(self.table('loan')), loan_rows)
+            self._insert_rows(conn, self.table('account_customers'), ac_rows)
+        customers_with_accounts = list({r['Customer_id'] for r in ac_rows})
+        with self._measure_tables('banking_transactions'):
+            if self.sharded:
+                shards = self.iter_shards('banking_transactions', self._split_ids(customers_with_accounts))
+                bt_chunks = chunked((row for shard_rows in shards for row in shard_rows), Config.CHUNK_SIZE)
+            else:
+                bt_chunks = self.iter_banking_transactions(customers_with_accounts)
+            self._insert_chunks(conn, self.table('banking_transactions'), bt_chunks)
+        if self.sharded:
+            # Cards and their transactions come out of the same shards, so they are measured together.
+            with self._measure_tables('credit_cards', 'cc_transactions'):
+                numbers = set()
+                for cards, cc_tx_rows in self.iter_shards('credit_cards', self._split_ids(customer_ids)):
+                    remap = self._dedupe_cards(cards, numbers)
+                    for row in cc_tx_rows:
+                        row['CC_Number'] = remap.get(row['CC_Number'], row['CC_Number'])
+                    self._insert_chunks(conn, self.table('credit_cards'), chunked(cards, Config.CHUNK_SIZE))
+                    self._insert_chunks(conn, self.table('cc_transactions'), chunked(cc_tx_rows, Config.CHUNK_SIZE))
+        else:
+            with self._measure_tables('credit_cards'):
+                cc_rows = self._credit_card_rows(customer_ids)
+                self._insert_rows(conn, self.table('credit_cards'), cc_rows)
+            with self._measure_tables('cc_transactions'):
+                self._insert_chunks(conn, self.table('cc_transactions'), self.iter_cc_transactions(cc_rows))
+        with self._measure_tables('loan'):
+            if self.sharded:
+                shards = self.iter_shards('loan', self._split_ids(customer_ids))
+                self._insert_chunks(conn, self.table('loan'), shards)
+            else:
+                self._insert_rows(conn, self.table('loan'), self._loan_rows(customer_ids))
+        with self._measure_tables('branch_employees'):
             be_rows = self.generate_branch_employees(branch_ids, employee_ids)
-            if be_rows:
-                conn.execute(insert(self.table('branch_employees')), be_rows)
-            self.enforce_business_rules(conn)
+            self._insert_rows(conn, self.table('branch_employees'), be_rows)
+        return employee_ids
 
-        return True
+    def _counter_chunks(self, rows: np.ndarray, build) -> Iterator[List[dict]]:
+        """Rows ``build`` derives from blocks of (parent) row positions, re-chunked to CHUNK_SIZE."""
+        built = (row for start in range(0, len(rows), self.VECTOR_BLOCK)
+                 for row in rows_from_columns(build(rows[start:start + self.VECTOR_BLOCK])))
+        return chunked(built, Config.CHUNK_SIZE)
+
+    def _load_counter_tables(self, conn) -> List[int]:
+        """_load_tables with counter-based values: each row depends only on its position, not on earlier rows."""
+        counter = self.counter
+        min_map = {}
+        if 'account_type' in self._table_objs:
+            with self._measure_tables('account_type'):
+                types = self.generate_account_type()
+                self._insert_rows(conn, self.table('account_type'), types)
+            min_map = {r['Account_Type']: r['Minimum_Balance_Restriction'] for r in types}
+        with self._measure_tables('branches'):
+            branch_ids = np.asarray(self._insert_chunks(
+                conn, self.table('branches'), self._counter_chunks(np.arange(Config.NUM_BRANCHES), counter.branches),
+                collect_ids=True))
+        with self._measure_tables('customers'):
+            customer_ids = np.asarray(self._insert_chunks(
+                conn, self.table('customers'), self._counter_chunks(np.arange(Config.NUM_CUSTOMERS), counter.customers),
+                collect_ids=True))
+        with self._measure_tables('employees'):
+            employee_ids = np.asarray(self._insert_chunks(
+                conn, self.table('employees'), self._counter_chunks(np.arange(Config.NUM_EMPLOYEES), counter.employees),
+                collect_ids=True))
+        with self._measure_tables('accounts'):
+            account_ids = np.asarray(self._insert_chunks(
+                conn, self.table('accounts'),
+                self._counter_chunks(np.arange(Config.NUM_ACCOUNTS), lambda rows: counter.accounts(rows, branch_ids, min_map)),
+                collect_ids=True))
+        with self._measure_tables('account_customers'):
+            account_rows, owner_rows = counter.account_customers(np.arange(len(account_ids)), len(customer_ids))
+            self._insert_rows(conn, self.table('account_customers'), rows_from_columns(
+                {'Account_id': account_ids[account_rows], 'Customer_id': customer_ids[owner_rows]}))
+        with self._measure_tables('banking_transactions'):
+            self._insert_chunks(conn, self.table('banking_transactions'), self._counter_chunks(
+                np.unique(owner_rows), lambda rows: counter.banking_transactions(rows, customer_ids)))
+        with self._measure_tables('credit_cards'):
+            columns, card_rows = counter.credit_cards(np.arange(len(customer_ids)), customer_ids)
+            cards = rows_from_columns(columns)
+            self._dedupe_cards(cards, set())
+            self._insert_chunks(conn, self.table('credit_cards'), chunked(cards, Config.CHUNK_SIZE))
+        with self._measure_tables('cc_transactions'):
+            self._insert_chunks(conn, self.table('cc_transactions'), self._counter_chunks(
+                np.arange(len(cards)), lambda block: counter.cc_transactions(card_rows[block], cards[block[0]:block[-1] + 1])))
+        with self._measure_tables('loan'):
+            self._insert_chunks(conn, self.table('loan'), self._counter_chunks(
+                np.arange(len(customer_ids)), lambda rows: counter.loans(rows, customer_ids)))
+        with self._measure_tables('branch_employees'):
+            self._insert_chunks(conn, self.table('branch_employees'), self._counter_chunks(
+                np.arange(len(employee_ids)), lambda rows: counter.branch_employees(rows, employee_ids, branch_ids)))
+        return employee_ids.tolist()
+
+
+_shard_generator: DataGenerator | None = None
+
+
+def _init_shard_worker(seed: int, metadata: MetaData, vectorized: bool):
+    global _shard_generator
+    _shard_generator = DataGenerator(seed=seed, vectorized=vectorized, metadata=metadata)
+
+
+def _run_shard_task(task: tuple):
+    return _shard_generator.run_shard(*task)
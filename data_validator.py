@@ -10,14 +10,23 @@ Implements 8 categories of validation rules:
 7. Data Cleanliness
 8. Reproducibility
 """
+import hashlib
+import json
+import threading
+import time
 from collections import defaultdict
-from datetime import date
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import date, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select, func, distinct, text
+from sqlalchemy import event, select, func, distinct, text, case, exists, and_
 from sqlalchemy.engine import Engine
 
-from schema_reflector import SchemaReflector
+from config import Config
+from metrics import Metrics
+from schema_reflector import SchemaReflector, SchemaSnapshot, schema_fingerprint
 
 
 class ValidationResult:
@@ -32,148 +41,497 @@ class ValidationResult:
         return f"[{status}] {self.category} - {self.rule}: {self.details}"
 
 
+class ValidationTask:
+    """An independently schedulable group of rules (one category, or one table of a per-table category)."""
+
+    def __init__(self, category: str, name: str, run: Callable[[], None],
+                 tables: Sequence[str] = (), date_dependent: bool = False):
+        self.category = category
+        self.name = name
+        self.run = run
+        # What the results depend on, for the result cache: the tables read and, for
+        # rules comparing against CURRENT_DATE, the day they ran.
+        self.tables = tuple(tables)
+        self.date_dependent = date_dependent
+
+    @property
+    def key(self) -> str:
+        return f"{self.category}/{self.name}"
+
+
+class ValidationCache:
+    """Task results persisted in a JSON file, each stored with the fingerprint it was computed for.
+
+    The header (database, schema, sample size) must match for any entry to be reused.
+    """
+
+    def __init__(self, path: str, header: dict):
+        self.path = Path(path)
+        self.header = header
+        self.entries: Dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+            except ValueError:
+                data = {}
+            if data.get('header') == header:
+                self.entries = data.get('tasks', {})
+
+    def get(self, key: str, fingerprint) -> Optional[List[ValidationResult]]:
+        entry = self.entries.get(key)
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return None
+        return [ValidationResult(*result) for result in entry['results']]
+
+    def watermarks(self) -> Dict[str, List[list]]:
+        """Per table, the [row count, max primary key] pairs seen in the cached fingerprints."""
+        seen: Dict[str, List[list]] = defaultdict(list)
+        for entry in self.entries.values():
+            for mark in entry['fingerprint']:
+                if isinstance(mark, list) and mark[1:3] not in seen[mark[0]]:
+                    seen[mark[0]].append(mark[1:3])
+        return seen
+
+    def put(self, key: str, fingerprint, results: List[ValidationResult]):
+        self.entries[key] = {
+            'fingerprint': fingerprint,
+            'results': [[r.category, r.rule, r.passed, r.details] for r in results],
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(json.dumps({'header': self.header, 'tasks': self.entries}, indent=2), encoding='utf-8')
+        tmp_path.replace(self.path)
+
+
 class DataValidator:
-    def __init__(self, reflector: SchemaReflector):
+    # Columns whose distinct count is needed besides the primary keys (uniqueness and variety rules).
+    DISTINCT_COLUMNS = {
+        'customers': ['Email', 'State'],
+        'credit_cards': ['CC_number'],
+        'accounts': ['Account_Type'],
+        'banking_transactions': ['Transaction_Type'],
+    }
+
+    def __init__(self, reflector: SchemaReflector, metrics: Optional[Metrics] = None):
         self.reflector = reflector
+        self.metrics = metrics if metrics is not None else Metrics()
         self.engine: Engine = reflector.engine
         self.metadata = reflector.metadata
         self.results: List[ValidationResult] = []
+        self.cache_hits = 0
+        self._stats: Dict[str, Dict[Tuple[str, ...], int]] = {}
+        self._stats_locks: Dict[str, threading.Lock] = {}
+        self._local = threading.local()
+
+    def validate_all(self, workers: Optional[int] = None, timeout: Optional[float] = None,
+                     cache_file: Optional[str] = None) -> List[ValidationResult]:
+        """Run every rule. With several workers, tasks run concurrently but results keep the serial order.
 
-    def validate_all(self) -> List[ValidationResult]:
+        ``timeout`` (seconds per task, 0 for none) turns a task that runs too long into a failed result.
+        With a ``cache_file``, a task whose tables have the same watermarks as in an earlier run
+        reuses that run's results instead of querying again.
+        """
+        workers = workers or Config.VALIDATION_WORKERS
+        timeout = timeout if timeout is not None else Config.VALIDATION_TIMEOUT
+        cache_file = cache_file if cache_file is not None else Config.VALIDATION_CACHE_FILE
         self.results = []
-        self.validate_foreign_keys()
-        self.validate_column_completeness()
-        self.validate_business_logic()
-        self.validate_temporal_consistency()
-        self.validate_uniqueness()
-        self.validate_realistic_distribution()
-        self.validate_data_cleanliness()
-        self.validate_reproducibility()
+        self._stats = {}
+        self.cache_hits = 0
+        tasks = self.build_tasks()
+        outputs: Dict[int, List[ValidationResult]] = {}
+        cache = fingerprints = None
+        if cache_file:
+            cache = self.open_cache(cache_file)
+            fingerprints = self.task_fingerprints(tasks, cache.watermarks())
+            for i, task in enumerate(tasks):
+                cached = cache.get(task.key, fingerprints[i])
+                if cached is not None:
+                    outputs[i] = cached
+                    self.cache_hits += 1
+        pending = [i for i in range(len(tasks)) if i not in outputs]
+        completed = self._run_tasks(tasks, pending, workers, timeout, outputs)
+        if cache is not None:
+            self.complete_fingerprints([fingerprints[i] for i in completed])
+            for i in completed:
+                cache.put(tasks[i].key, fingerprints[i], outputs[i])
+            cache.save()
+        for i in range(len(tasks)):
+            self.results.extend(outputs[i])
         return self.results
 
+    def _run_tasks(self, tasks: List[ValidationTask], indices: List[int], workers: int, timeout: float,
+                   outputs: Dict[int, List[ValidationResult]]) -> List[int]:
+        """Run ``tasks[i]`` for each index into ``outputs``; returns the indices that finished (not timed out).
+
+        With a timeout, tasks run on worker threads (even with one worker) and the statement a
+        timed-out task is executing is cancelled: ``interrupt()`` on SQLite, ``KILL QUERY`` on
+        MySQL. Only connections the timed-out task still holds are cancelled, so a worker that
+        has meanwhile moved on to its next task is left alone. Other dialects cannot be
+        cancelled, so the task's thread keeps running (and holding its connection) until its
+        query returns, and the interpreter waits for it at exit.
+        """
+        if workers <= 1 and not timeout:
+            for i in indices:
+                outputs[i] = self._run_task(tasks[i])
+            return list(indices)
+        
+        started: Dict[int, float] = {}
+        completed = []
+        # Task index running on each worker thread, and the task holding each checked-out DB-API
+        # connection, so a timed-out task's query (and only its query) can be cancelled. Reentrant:
+        # cancelling on MySQL checks out a connection on the main thread while holding the lock.
+        lock = threading.RLock()
+        active: Dict[int, int] = {}
+        holders: Dict[int, tuple] = {}
+        
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            with lock:
+                index = active.get(threading.get_ident())
+                if index is not None:
+                    holders[id(dbapi_connection)] = (dbapi_connection, index)
+        
+        def checkin(dbapi_connection, connection_record):
+            with lock:
+                holders.pop(id(dbapi_connection), None)
+        
+        def run(index, task):
+            with lock:
+                active[threading.get_ident()] = index
+            started[index] = time.monotonic()
+            try:
+                return self._run_task(task)
+            finally:
+                with lock:
+                    active.pop(threading.get_ident(), None)
+        
+        if timeout:
+            event.listen(self.engine, 'checkout', checkout)
+            event.listen(self.engine, 'checkin', checkin)
+        pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        try:
+            futures = [(i, pool.submit(run, i, tasks[i])) for i in indices]
+            for i, future in futures:
+                while True:
+                    try:
+                        outputs[i] = future.result(timeout=0.05 if timeout else None)
+                        completed.append(i)
+                        break
+                    except FutureTimeout:
+                        if i in started and time.monotonic() - started[i] > timeout:
+                            task = tasks[i]
+                            outputs[i] = [ValidationResult(task.category, task.name, False, f"Timed out after {timeout}s")]
+                            with lock:
+                                for dbapi_connection, holder in list(holders.values()):
+                                    if holder == i:
+                                        self._cancel_statement(dbapi_connection)
+                            break
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            if timeout:
+                event.remove(self.engine, 'checkout', checkout)
+                event.remove(self.engine, 'checkin', checkin)
+        return completed
+
+    def _cancel_statement(self, dbapi_connection):
+        """Abort the statement running on another thread's DB-API connection, where the dialect allows it."""
+        try:
+            if self.engine.dialect.name == 'sqlite':
+                dbapi_connection.interrupt()
+            elif self.engine.dialect.name == 'mysql':
+                with self.engine.connect() as conn:
+                    conn.exec_driver_sql(f"KILL QUERY {int(dbapi_connection.thread_id())}")
+        except Exception:
+            # The statement may have finished in the meantime; the task is reported as timed out either way.
+            pass
+
+    def open_cache(self, cache_file: str) -> ValidationCache:
+        header = {
+            'database': hashlib.sha256(str(self.engine.url).encode('utf-8')).hexdigest()[:16],
+            'schema': self.schema_signature(),
+            'sample_size': Config.VALIDATION_SAMPLE_SIZE,
+        }
+        return ValidationCache(cache_file, header)
+
+    def schema_signature(self) -> str:
+        """Fingerprint of the live schema (not the snapshot's, which is only set with SCHEMA_CACHE_DIR)."""
+        fingerprint = schema_fingerprint(self.engine)
+        if fingerprint is None:
+            # No cheap catalog query for this dialect: hash a fresh reflection instead.
+            snapshot = SchemaSnapshot.reflect(self.engine)
+            described = (snapshot.tables, snapshot.columns, snapshot.primary_keys, snapshot.foreign_keys)
+            fingerprint = hashlib.sha256(repr(described).encode('utf-8')).hexdigest()
+        return fingerprint
+
+    def task_fingerprints(self, tasks: List[ValidationTask],
+                          known: Optional[Dict[str, List[list]]] = None) -> List[list]:
+        """Per task, the watermarks of the tables it reads (plus today's date for date-dependent tasks).
+
+        A table's checksum is only computed when its row count and max primary key match a
+        watermark in ``known`` (from the cache); otherwise no cached entry can match and it is
+        left as None, to be filled in by ``complete_fingerprints`` if results are stored.
+        """
+        known = known if known is not None else {}
+        needed = sorted({t for task in tasks for t in task.tables})
+        with self.engine.connect() as conn:
+            marks = {}
+            for t in needed:
+                mark = self.table_watermark(conn, t)
+                marks[t] = mark + [self.table_checksum(conn, t) if mark in known.get(t, []) else None]
+        today = date.today().isoformat()
+        fingerprints = []
+        for task in tasks:
+            fingerprint = [[t] + marks[t] for t in sorted(task.tables)]
+            if task.date_dependent:
+                fingerprint.append(today)
+            fingerprints.append(fingerprint)
+        return fingerprints
+
+    def complete_fingerprints(self, fingerprints: List[list]):
+        """Compute the checksums task_fingerprints skipped, in place (once per table)."""
+        checksums: Dict[str, str] = {}
+        with self.engine.connect() as conn:
+            for fingerprint in fingerprints:
+                for mark in fingerprint:
+                    if isinstance(mark, list) and mark[3] is None:
+                        if mark[0] not in checksums:
+                            checksums[mark[0]] = self.table_checksum(conn, mark[0])
+                        mark[3] = checksums[mark[0]]
+
+    def table_watermark(self, conn, table_name: str) -> list:
+        """[row count, max primary key] for one table."""
+        table = self.metadata.tables[table_name]
+        pk_cols = list(table.primary_key.columns)
+        max_pk = func.max(pk_cols[0]) if len(pk_cols) == 1 else None
+        columns = [func.count()] + ([max_pk] if max_pk is not None else [])
+        row = conn.execute(select(*columns).select_from(table)).one()
+        count = row[0]
+        max_value = str(row[1]) if max_pk is not None and row[1] is not None else None
+        return [count, max_value]
+
+    def table_checksum(self, conn, table_name: str) -> str:
+        """CHECKSUM TABLE on MySQL; elsewhere a hash of every row streamed in primary key order."""
+        if conn.dialect.name == 'mysql':
+            quoted = conn.dialect.identifier_preparer.quote(table_name)
+            return str(conn.exec_driver_sql(f"CHECKSUM TABLE {quoted}").one()[1])
+        table = self.metadata.tables[table_name]
+        order = list(table.primary_key.columns) or list(table.columns)
+        digest = hashlib.blake2b(digest_size=16)
+        result = conn.execution_options(stream_results=True, yield_per=Config.EXPORT_BATCH_SIZE).execute(
+            select(table).order_by(*order))
+        for row in result:
+            digest.update(repr(tuple(row)).encode('utf-8'))
+        return digest.hexdigest()
+
+    def build_tasks(self) -> List[ValidationTask]:
+        """All rules in report order; per-table categories are split into one task per table."""
+        tables = self.reflector.get_all_tables()
+        
+        def present(*names):
+            return [name for name in names if name in self.metadata.tables]
+        
+        tasks = []
+        for parent_name, fks in self.foreign_key_groups().items():
+            tasks.append(ValidationTask("Foreign Key Integrity", f"FK into {parent_name}",
+                                        partial(self._in_connection, self._check_foreign_keys, parent_name, fks),
+                                        tables={parent_name} | {child for child, _, _ in fks}))
+        for table_name in tables:
+            tasks.append(ValidationTask("Column Completeness", f"Completeness: {table_name}",
+                                        partial(self._in_connection, self._check_completeness, table_name),
+                                        tables=[table_name]))
+        tasks.append(ValidationTask("Business Logic Validation", "Business Logic Validation", self.validate_business_logic,
+                                    tables=present('customers', 'accounts', 'account_type', 'loan', 'credit_cards',
+                                                   'banking_transactions', 'cc_transactions'),
+                                    date_dependent=True))
+        tasks.append(ValidationTask("Temporal Consistency", "Temporal Consistency", self.validate_temporal_consistency,
+                                    tables=present('banking_transactions', 'cc_transactions', 'accounts',
+                                                   'account_customers', 'branch_employees'),
+                                    date_dependent=True))
+        for table_name in tables:
+            tasks.append(ValidationTask("Uniqueness Constraints", f"PK Unique: {table_name}",
+                                        partial(self._in_connection, self._check_primary_key, table_name),
+                                        tables=[table_name]))
+        tasks.append(ValidationTask("Uniqueness Constraints", "Unique Columns",
+                                    partial(self._in_connection, self._check_unique_columns),
+                                    tables=present('customers', 'credit_cards')))
+        tasks.append(ValidationTask("Realistic Distribution", "Realistic Distribution", self.validate_realistic_distribution,
+                                    tables=present('accounts', 'customers', 'banking_transactions')))
+        tasks.append(ValidationTask("Data Cleanliness", "Data Cleanliness", self.validate_data_cleanliness,
+                                    tables=present('customers')))
+        tasks.append(ValidationTask("Reproducibility", "Reproducibility", self.validate_reproducibility,
+                                    tables=tables))
+        return tasks
+
+    def _run_task(self, task: ValidationTask) -> List[ValidationResult]:
+        self._local.results = []
+        try:
+            with self.metrics.stage('validate', task.key):
+                task.run()
+            return self._local.results
+        finally:
+            self._local.results = None
+
+    def _in_connection(self, check: Callable, *args):
+        with self.engine.connect() as conn:
+            check(conn, *args)
+
     def add_result(self, category: str, rule: str, passed: bool, details: str = ""):
-        self.results.append(ValidationResult(category, rule, passed, details))
+        target = getattr(self._local, 'results', None)
+        (target if target is not None else self.results).append(ValidationResult(category, rule, passed, details))
+
+    def table_stats(self, conn, table_name: str) -> Dict[Tuple[str, ...], int]:
+        """Row count, NULL counts, max lengths and distinct counts for a table from one aggregate query.
+
+        Keys are ('total',), ('nulls', col), ('max_len', col) and ('distinct', col). Cached per validate_all run.
+        """
+        with self._stats_locks.setdefault(table_name, threading.Lock()):
+            if table_name not in self._stats:
+                self._stats[table_name] = self._query_table_stats(conn, table_name)
+            return self._stats[table_name]
+
+    def _query_table_stats(self, conn, table_name: str) -> Dict[Tuple[str, ...], int]:
+        table = self.metadata.tables[table_name]
+        keys = [('total',)]
+        exprs = [func.count()]
+        for col_info in self.reflector.get_table_columns(table_name):
+            col = table.c[col_info['name']]
+            if not col_info['nullable']:
+                keys.append(('nulls', col.name))
+                exprs.append(func.sum(case((col.is_(None), 1), else_=0)))
+            if getattr(col.type, 'length', None):
+                keys.append(('max_len', col.name))
+                exprs.append(func.max(func.length(col)))
+        for col_name in self.reflector.get_primary_keys(table_name) + self.DISTINCT_COLUMNS.get(table_name, []):
+            if ('distinct', col_name) not in keys:
+                keys.append(('distinct', col_name))
+                exprs.append(func.count(distinct(table.c[col_name])))
+        row = conn.execute(select(*exprs).select_from(table)).one()
+        return {key: int(value or 0) for key, value in zip(keys, row)}
+
+    def foreign_key_groups(self) -> Dict[str, List[Tuple[str, str, str]]]:
+        """Single-column FKs grouped by parent table: {parent: [(child table, column, parent column)]}."""
+        groups: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
+        for table_name in self.reflector.get_all_tables():
+            for fk in self.reflector.get_foreign_keys(table_name):
+                constrained_cols = fk['constrained_columns']
+                referred_cols = fk['referred_columns']
+                if len(constrained_cols) != 1 or len(referred_cols) != 1:
+                    continue
+                groups[fk['referred_table']].append((table_name, constrained_cols[0], referred_cols[0]))
+        return groups
 
     def validate_foreign_keys(self):
-        category = "Foreign Key Integrity"
-        tables = self.reflector.get_all_tables()
         with self.engine.connect() as conn:
-            for table_name in tables:
-                fks = self.reflector.get_foreign_keys(table_name)
-                for fk in fks:
-                    constrained_cols = fk['constrained_columns']
-                    referred_table = fk['referred_table']
-                    referred_cols = fk['referred_columns']
-                    if len(constrained_cols) != 1 or len(referred_cols) != 1:
-                        continue
-                    col = constrained_cols[0]
-                    ref_col = referred_cols[0]
-                    table = self.metadata.tables[table_name]
-                    ref_table = self.metadata.tables[referred_table]
-                    query = select(func.count()).select_from(table).where(
-                        table.c[col].isnot(None),
-                        ~table.c[col].in_(select(ref_table.c[ref_col]))
-                    )
-                    orphan_count = conn.execute(query).scalar()
-                    passed = orphan_count == 0
-                    details = f"{table_name}.{col} -> {referred_table}.{ref_col}: {orphan_count} orphan rows"
-                    self.add_result(category, f"FK: {table_name}.{col}", passed, details)
+            for parent_name, fks in self.foreign_key_groups().items():
+                self._check_foreign_keys(conn, parent_name, fks)
+
+    def _check_foreign_keys(self, conn, parent_name: str, fks: List[Tuple[str, str, str]]):
+        """Check every FK into one parent with a single statement of NOT EXISTS anti-join counts."""
+        category = "Foreign Key Integrity"
+        parent = self.metadata.tables[parent_name].alias('parent')
+        orphan_conditions = []
+        counts = []
+        for table_name, col, ref_col in fks:
+            table = self.metadata.tables[table_name]
+            condition = and_(
+                table.c[col].isnot(None),
+                ~exists().where(parent.c[ref_col] == table.c[col])
+            )
+            orphan_conditions.append(condition)
+            counts.append(select(func.count()).select_from(table).where(condition).scalar_subquery())
+        orphan_counts = conn.execute(select(*counts)).one()
+        for (table_name, col, ref_col), condition, orphan_count in zip(fks, orphan_conditions, orphan_counts):
+            table = self.metadata.tables[table_name]
+            sample = []
+            if orphan_count and Config.VALIDATION_SAMPLE_SIZE:
+                query = select(table.c[col]).where(condition).distinct().limit(Config.VALIDATION_SAMPLE_SIZE)
+                sample = [row[0] for row in conn.execute(query).fetchall()]
+            details = f"{table_name}.{col} -> {parent_name}.{ref_col}: {orphan_count} orphan rows"
+            self.add_violation_result(category, f"FK: {table_name}.{col}", orphan_count, sample, details)
 
     def validate_column_completeness(self):
-        category = "Column Completeness"
         tables = self.reflector.get_all_tables()
         with self.engine.connect() as conn:
             for table_name in tables:
-                table = self.metadata.tables[table_name]
-                columns = self.reflector.get_table_columns(table_name)
-                for col_info in columns:
-                    col_name = col_info['name']
-                    nullable = col_info['nullable']
-                    if not nullable:
-                        null_count = conn.execute(
-                            select(func.count()).select_from(table).where(table.c[col_name].is_(None))
-                        ).scalar()
-                        passed = null_count == 0
-                        details = f"{table_name}.{col_name}: {null_count} null values in NOT NULL column"
-                        self.add_result(category, f"NOT NULL: {table_name}.{col_name}", passed, details)
-                    col_obj = table.c[col_name]
-                    if hasattr(col_obj.type, 'length') and col_obj.type.length:
-                        max_len = col_obj.type.length
-                        query = select(func.max(func.length(col_obj))).select_from(table)
-                        actual_max = conn.execute(query).scalar() or 0
-                        passed = actual_max <= max_len
-                        details = f"{table_name}.{col_name}: max length {actual_max}/{max_len}"
-                        self.add_result(category, f"Length: {table_name}.{col_name}", passed, details)
+                self._check_completeness(conn, table_name)
+
+    def _check_completeness(self, conn, table_name: str):
+        category = "Column Completeness"
+        table = self.metadata.tables[table_name]
+        stats = self.table_stats(conn, table_name)
+        columns = self.reflector.get_table_columns(table_name)
+        for col_info in columns:
+            col_name = col_info['name']
+            nullable = col_info['nullable']
+            if not nullable:
+                null_count = stats[('nulls', col_name)]
+                passed = null_count == 0
+                details = f"{table_name}.{col_name}: {null_count} null values in NOT NULL column"
+                self.add_result(category, f"NOT NULL: {table_name}.{col_name}", passed, details)
+            col_obj = table.c[col_name]
+            if hasattr(col_obj.type, 'length') and col_obj.type.length:
+                max_len = col_obj.type.length
+                actual_max = stats[('max_len', col_name)]
+                passed = actual_max <= max_len
+                details = f"{table_name}.{col_name}: max length {actual_max}/{max_len}"
+                self.add_result(category, f"Length: {table_name}.{col_name}", passed, details)
+
+    def count_violations(self, conn, from_clause, condition, key_column=None) -> Tuple[int, List]:
+        """Count rows matching ``condition`` server-side and fetch a few of their keys for debugging."""
+        count = conn.execute(select(func.count()).select_from(from_clause).where(condition)).scalar()
+        sample = []
+        if count and key_column is not None and Config.VALIDATION_SAMPLE_SIZE:
+            query = select(key_column).select_from(from_clause).where(condition).limit(Config.VALIDATION_SAMPLE_SIZE)
+            sample = [row[0] for row in conn.execute(query).fetchall()]
+        return count, sample
+
+    def add_violation_result(self, category: str, rule: str, count: int, sample: List, details: str):
+        if sample:
+            details += f" (e.g. {', '.join(str(key) for key in sample)})"
+        self.add_result(category, rule, count == 0, details)
+
+    def business_rules(self) -> List[Tuple]:
+        """Business rules as (rule, from clause, violation condition, key column, details template)."""
+        tables = self.metadata.tables
+        rules = []
+        if 'customers' in tables:
+            t = tables['customers']
+            cutoff = date.today() - timedelta(days=18 * 365)
+            rules.append(("Customer Age >= 18", t, t.c.Date_of_Birth > cutoff, t.c.Customer_id,
+                          "{} customers under 18 years old"))
+        if 'accounts' in tables and 'account_type' in tables:
+            acc = tables['accounts']
+            at = tables['account_type']
+            rules.append(("Account Balance >= Minimum", acc.join(at, acc.c.Account_Type == at.c.Account_Type),
+                          acc.c.Account_Balance < at.c.Minimum_Balance_Restriction, acc.c.Account_id,
+                          "{} accounts below minimum balance"))
+        if 'loan' in tables:
+            loan = tables['loan']
+            rules.append(("Loan Repaid <= Taken", loan, loan.c.Loan_Amount_Repaid > loan.c.Loan_Amount_Taken,
+                          loan.c.Loan_id, "{} loans with repaid > taken"))
+        if 'credit_cards' in tables:
+            cc = tables['credit_cards']
+            rules.append(("Credit Score Range", cc, (cc.c.Credit_Score < 300) | (cc.c.Credit_Score > 850),
+                          cc.c.CC_number, "{} credit scores outside 300-850 range"))
+            rules.append(("Credit Card Not Expired", cc, cc.c.Expiry_Date < func.current_date(),
+                          cc.c.CC_number, "{} expired credit cards"))
+        if 'banking_transactions' in tables:
+            bt = tables['banking_transactions']
+            rules.append(("Banking Transaction Amount Range", bt, (bt.c.Amount < 1) | (bt.c.Amount > 2500),
+                          bt.c.Transaction_id, "{} banking transactions outside 1-2500 range"))
+        if 'cc_transactions' in tables:
+            cct = tables['cc_transactions']
+            rules.append(("CC Transaction Amount Range", cct, (cct.c.Amount < 1) | (cct.c.Amount > 2500),
+                          cct.c.Transaction_id, "{} CC transactions outside 1-2500 range"))
+        return rules
 
     def validate_business_logic(self):
         category = "Business Logic Validation"
         with self.engine.connect() as conn:
-            if 'customers' in self.metadata.tables:
-                t = self.metadata.tables['customers']
-                today = date.today()
-                rows = conn.execute(select(t.c.Customer_id, t.c.Date_of_Birth)).fetchall()
-                under_18 = sum(1 for _, dob in rows if (today - dob).days < 18 * 365)
-                passed = under_18 == 0
-                details = f"{under_18} customers under 18 years old"
-                self.add_result(category, "Customer Age >= 18", passed, details)
-            if 'accounts' in self.metadata.tables and 'account_type' in self.metadata.tables:
-                acc = self.metadata.tables['accounts']
-                at = self.metadata.tables['account_type']
-                query = select(acc.c.Account_id, acc.c.Account_Balance, acc.c.Account_Type, at.c.Minimum_Balance_Restriction).select_from(
-                    acc.join(at, acc.c.Account_Type == at.c.Account_Type)
-                )
-                violations = 0
-                for row in conn.execute(query).fetchall():
-                    if float(row[1]) < float(row[3]):
-                        violations += 1
-                passed = violations == 0
-                details = f"{violations} accounts below minimum balance"
-                self.add_result(category, "Account Balance >= Minimum", passed, details)
-            if 'loan' in self.metadata.tables:
-                loan = self.metadata.tables['loan']
-                query = select(func.count()).select_from(loan).where(
-                    loan.c.Loan_Amount_Repaid > loan.c.Loan_Amount_Taken
-                )
-                violations = conn.execute(query).scalar()
-                passed = violations == 0
-                details = f"{violations} loans with repaid > taken"
-                self.add_result(category, "Loan Repaid <= Taken", passed, details)
-            if 'credit_cards' in self.metadata.tables:
-                cc = self.metadata.tables['credit_cards']
-                query = select(func.count()).select_from(cc).where(
-                    (cc.c.Credit_Score < 300) | (cc.c.Credit_Score > 850)
-                )
-                violations = conn.execute(query).scalar()
-                passed = violations == 0
-                details = f"{violations} credit scores outside 300-850 range"
-                self.add_result(category, "Credit Score Range", passed, details)
-            if 'credit_cards' in self.metadata.tables:
-                cc = self.metadata.tables['credit_cards']
-                query = select(func.count()).select_from(cc).where(
-                    cc.c.Expiry_Date < func.current_date()
-                )
-                violations = conn.execute(query).scalar()
-                passed = violations == 0
-                details = f"{violations} expired credit cards"
-                self.add_result(category, "Credit Card Not Expired", passed, details)
-            if 'banking_transactions' in self.metadata.tables:
-                bt = self.metadata.tables['banking_transactions']
-                query = select(func.count()).select_from(bt).where(
-                    (bt.c.Amount < 1) | (bt.c.Amount > 2500)
-                )
-                violations = conn.execute(query).scalar()
-                passed = violations == 0
-                details = f"{violations} banking transactions outside 1-2500 range"
-                self.add_result(category, "Banking Transaction Amount Range", passed, details)
-            if 'cc_transactions' in self.metadata.tables:
-                cct = self.metadata.tables['cc_transactions']
-                query = select(func.count()).select_from(cct).where(
-                    (cct.c.Amount < 1) | (cct.c.Amount > 2500)
-                )
-                violations = conn.execute(query).scalar()
-                passed = violations == 0
-                details = f"{violations} CC transactions outside 1-2500 range"
-                self.add_result(category, "CC Transaction Amount Range", passed, details)
+            for rule, from_clause, condition, key_column, template in self.business_rules():
+                count, sample = self.count_violations(conn, from_clause, condition, key_column)
+                self.add_violation_result(category, rule, count, sample, template.format(count))
 
     def validate_temporal_consistency(self):
         category = "Temporal Consistency"
@@ -219,56 +577,56 @@ class DataValidator:
                 self.add_result(category, "Employee End >= Start", passed, details)
 
     def validate_uniqueness(self):
-        category = "Uniqueness Constraints"
         with self.engine.connect() as conn:
-            tables = self.reflector.get_all_tables()
-            for table_name in tables:
-                pks = self.reflector.get_primary_keys(table_name)
-                if not pks:
-                    continue
-                table = self.metadata.tables[table_name]
-                for pk in pks:
-                    total = conn.execute(select(func.count()).select_from(table)).scalar()
-                    distinct_count = conn.execute(select(func.count(distinct(table.c[pk]))).select_from(table)).scalar()
-                    passed = total == distinct_count
-                    details = f"{table_name}.{pk}: {total} total, {distinct_count} distinct"
-                    self.add_result(category, f"PK Unique: {table_name}.{pk}", passed, details)
-            if 'customers' in self.metadata.tables:
-                t = self.metadata.tables['customers']
-                total = conn.execute(select(func.count()).select_from(t)).scalar()
-                distinct_count = conn.execute(select(func.count(distinct(t.c.Email))).select_from(t)).scalar()
-                passed = total == distinct_count
-                details = f"customers.Email: {total} total, {distinct_count} distinct"
-                self.add_result(category, "Email Unique", passed, details)
-            if 'credit_cards' in self.metadata.tables:
-                t = self.metadata.tables['credit_cards']
-                total = conn.execute(select(func.count()).select_from(t)).scalar()
-                distinct_count = conn.execute(select(func.count(distinct(t.c.CC_number))).select_from(t)).scalar()
-                passed = total == distinct_count
-                details = f"credit_cards.CC_number: {total} total, {distinct_count} distinct"
-                self.add_result(category, "CC Number Unique", passed, details)
+            for table_name in self.reflector.get_all_tables():
+                self._check_primary_key(conn, table_name)
+            self._check_unique_columns(conn)
+
+    def _check_primary_key(self, conn, table_name: str):
+        category = "Uniqueness Constraints"
+        pks = self.reflector.get_primary_keys(table_name)
+        if not pks:
+            return
+        stats = self.table_stats(conn, table_name)
+        for pk in pks:
+            total = stats[('total',)]
+            distinct_count = stats[('distinct', pk)]
+            passed = total == distinct_count
+            details = f"{table_name}.{pk}: {total} total, {distinct_count} distinct"
+            self.add_result(category, f"PK Unique: {table_name}.{pk}", passed, details)
+
+    def _check_unique_columns(self, conn):
+        category = "Uniqueness Constraints"
+        if 'customers' in self.metadata.tables:
+            stats = self.table_stats(conn, 'customers')
+            total = stats[('total',)]
+            distinct_count = stats[('distinct', 'Email')]
+            passed = total == distinct_count
+            details = f"customers.Email: {total} total, {distinct_count} distinct"
+            self.add_result(category, "Email Unique", passed, details)
+        if 'credit_cards' in self.metadata.tables:
+            stats = self.table_stats(conn, 'credit_cards')
+            total = stats[('total',)]
+            distinct_count = stats[('distinct', 'CC_number')]
+            passed = total == distinct_count
+            details = f"credit_cards.CC_number: {total} total, {distinct_count} distinct"
+            self.add_result(category, "CC Number Unique", passed, details)
 
     def validate_realistic_distribution(self):
         category = "Realistic Distribution"
         with self.engine.connect() as conn:
             if 'accounts' in self.metadata.tables:
-                acc = self.metadata.tables['accounts']
-                query = select(func.count(distinct(acc.c.Account_Type))).select_from(acc)
-                distinct_types = conn.execute(query).scalar()
+                distinct_types = self.table_stats(conn, 'accounts')[('distinct', 'Account_Type')]
                 passed = distinct_types >= 3
                 details = f"{distinct_types} distinct account types"
                 self.add_result(category, "Account Type Variety", passed, details)
             if 'customers' in self.metadata.tables:
-                cust = self.metadata.tables['customers']
-                query = select(func.count(distinct(cust.c.State))).select_from(cust)
-                distinct_states = conn.execute(query).scalar()
+                distinct_states = self.table_stats(conn, 'customers')[('distinct', 'State')]
                 passed = distinct_states >= 10
                 details = f"{distinct_states} distinct states"
                 self.add_result(category, "Customer State Variety", passed, details)
             if 'banking_transactions' in self.metadata.tables:
-                bt = self.metadata.tables['banking_transactions']
-                query = select(func.count(distinct(bt.c.Transaction_Type))).select_from(bt)
-                distinct_types = conn.execute(query).scalar()
+                distinct_types = self.table_stats(conn, 'banking_transactions')[('distinct', 'Transaction_Type')]
                 passed = distinct_types >= 2
                 details = f"{distinct_types} distinct transaction types"
                 self.add_result(category, "Transaction Type Variety", passed, details)
@@ -301,8 +659,7 @@ class DataValidator:
             tables = self.reflector.get_all_tables()
             all_have_data = True
             for table_name in tables:
-                table = self.metadata.tables[table_name]
-                count = conn.execute(select(func.count()).select_from(table)).scalar()
+                count = self.table_stats(conn, table_name)[('total',)]
                 if count == 0:
                     all_have_data = False
                     break
@@ -0,0 +1,53 @@
+"""
+Primary key allocation module.
+Assigns surrogate keys on the client so child rows can reference their
+parents without re-reading the parent table after insert.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import MetaData, Table, Integer, select, func
+
+
+class KeyRegistry:
+    """Hands out contiguous, explicit primary keys for single-column integer PK tables."""
+
+    def __init__(self, metadata: MetaData, conn=None):
+        self.metadata = metadata
+        self.conn = conn
+        self._next: Dict[str, int] = {}
+
+    def key_column(self, table_name: str) -> Optional[str]:
+        """Name of the surrogate key column, or None for natural/composite keys."""
+        table: Table = self.metadata.tables[table_name]
+        pk_cols = list(table.primary_key.columns)
+        if len(pk_cols) != 1 or not isinstance(pk_cols[0].type, Integer):
+            return None
+        return pk_cols[0].name
+
+    def _start(self, table_name: str, key_col: str) -> int:
+        if self.conn is None:
+            return 1
+        table = self.metadata.tables[table_name]
+        current = self.conn.execute(select(func.max(table.c[key_col]))).scalar()
+        return (current or 0) + 1
+
+    def reserve(self, table_name: str, n: int) -> range:
+        """Reserve ``n`` consecutive keys for ``table_name``."""
+        key_col = self.key_column(table_name)
+        if key_col is None:
+            raise ValueError(f"{table_name} has no single-column integer primary key")
+        if table_name not in self._next:
+            self._next[table_name] = self._start(table_name, key_col)
+        start = self._next[table_name]
+        self._next[table_name] = start + n
+        return range(start, start + n)
+
+    def assign(self, table_name: str, rows: List[dict]) -> List[int]:
+        """Write reserved keys into ``rows`` in order and return them; no-op for natural keys."""
+        key_col = self.key_column(table_name)
+        if key_col is None:
+            return []
+        ids = list(self.reserve(table_name, len(rows)))
+        for row, key in zip(rows, ids):
+            row[key_col] = key
+        return ids
@@ -3,15 +3,17 @@
 Main script for data generation and validation system.
 Orchestrates schema reflection, data generation, validation, and export.
 """
+import argparse
 import sys
-import time
 from pathlib import Path
 
 from config import Config
-from schema_reflector import SchemaReflector
+from schema_reflector import SchemaReflector, load_cached_snapshot, schema_from_sql
 from data_generator import DataGenerator
 from data_validator import DataValidator
-from data_exporter import DataExporter
+from data_exporter import DataExporter, DirectExporter
+from metrics import Metrics
+from sql_profiler import SqlProfiler
 
 
 def print_banner():
@@ -21,7 +23,85 @@ def print_banner():
     print()
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate, validate and export mock banking data.")
+    parser.add_argument('--json-format', choices=['array', 'jsonl'], default='array',
+                        help="JSON export layout: pretty-printed array (default) or JSON Lines")
+    parser.add_argument('--gzip', action='store_true', help="gzip-compress export files on the fly")
+    parser.add_argument('--summary', choices=['recorded', 'estimate', 'exact'], default='recorded',
+                        help="How Step 6 counts rows: counts recorded during generation/export (default), "
+                             "information_schema estimates, or exact COUNT(*)")
+    parser.add_argument('--no-db', action='store_true',
+                        help="Generate straight to the export files without a database (skips validation)")
+    parser.add_argument('--schema', choices=['snapshot', 'sql'], default='snapshot',
+                        help="Schema source for --no-db: the cached reflection snapshot (default, falls back "
+                             "to the DDL script when there is none) or the DDL script")
+    parser.add_argument('--sql-file', default='Sql_code.txt', help="DDL script used for the --no-db schema")
+    return parser.parse_args(argv)
+
+
+def write_metrics(metrics):
+    """Write the run metrics to the configured JSON / Prometheus files."""
+    try:
+        if Config.METRICS_FILE:
+            print(f"  - Run metrics: {metrics.write_json(Config.METRICS_FILE)}")
+        if Config.METRICS_PROMETHEUS_FILE:
+            print(f"  - Prometheus metrics: {metrics.write_prometheus(Config.METRICS_PROMETHEUS_FILE)}")
+    except OSError as e:
+        print(f"  ⚠️  Could not write metrics: {e}")
+
+
+def run_without_database(args, metrics):
+    """Generate every table straight to ./exports/, producing the files a database run would export."""
+    json_format = 'jsonl' if args.json_format == 'jsonl' else 'json'
+    try:
+        print("Step 1: Loading schema...")
+        with metrics.stage('schema'):
+            snapshot = load_cached_snapshot(Config.get_database_url()) if args.schema == 'snapshot' else None
+            if snapshot is not None:
+                metadata = snapshot.metadata
+                print("  ✓ Using cached schema snapshot")
+            else:
+                metadata = schema_from_sql(args.sql_file)
+                print(f"  ✓ Parsed schema from {args.sql_file}")
+        print(f"  ✓ Found {len(metadata.tables)} tables: {', '.join(metadata.tables)}")
+        print()
+        
+        print("Step 2: Generating mock data straight to export files...")
+        with metrics.stage('generate') as record:
+            generator = DataGenerator(seed=Config.RANDOM_SEED, metadata=metadata, metrics=metrics)
+            exporter = DirectExporter(metadata, formats=(json_format, 'csv'), compress=args.gzip)
+            export_results = generator.generate_to_files(exporter)
+            record['rows'] = sum(exporter.row_counts.values())
+        elapsed = metrics.seconds('generate')
+        print(f"  ✓ Exported {len(export_results)} tables to ./exports/ in {elapsed:.2f} seconds")
+        for table_name, paths in export_results.items():
+            print(f"    - {table_name}: {', '.join(Path(p).name for p in paths.values())}")
+        print()
+        
+        print("Step 3: Summary...")
+        total_records = sum(exporter.row_counts.values())
+        print(f"  Total records generated: {total_records}")
+        for table_name in export_results:
+            print(f"    - {table_name}: {exporter.row_counts[table_name]} records")
+        print()
+        
+        print("=" * 80)
+        print("  ✓ All operations completed successfully!")
+        print("=" * 80)
+        return 0
+        
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    finally:
+        write_metrics(metrics)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     print_banner()
     
     print(f"Configuration:")
@@ -34,38 +114,50 @@ def main():
     print(f"  Accounts: {Config.NUM_ACCOUNTS}")
     print()
     
+    metrics = Metrics()
+    if args.no_db:
+        return run_without_database(args, metrics)
+    
+    profiler = SqlProfiler() if Config.SQL_PROFILE else None
     try:
         print("Step 1: Connecting to database and reflecting schema...")
-        reflector = SchemaReflector()
-        reflector.reflect_schema()
-        tables = reflector.get_all_tables()
+        with metrics.stage('schema'):
+            reflector = SchemaReflector()
+            if profiler is not None:
+                profiler.attach(reflector.engine)
+            reflector.reflect_schema()
+            tables = reflector.get_all_tables()
+            dependencies = reflector.get_table_dependencies()
         print(f"  ✓ Found {len(tables)} tables: {', '.join(tables)}")
-        
-        dependencies = reflector.get_table_dependencies()
         print(f"  ✓ Determined insertion order: {' -> '.join(dependencies)}")
         print()
         
         print("Step 2: Generating mock data...")
-        start_time = time.time()
-        generator = DataGenerator(seed=Config.RANDOM_SEED)
+        with metrics.stage('generate') as record:
+            generator = DataGenerator(seed=Config.RANDOM_SEED, reflector=reflector, metrics=metrics)
+            
+            print("  - Truncating existing data...")
+            generator.truncate_all()
+            
+            print("  - Generating and inserting data...")
+            generator.generate_and_insert_all()
+            record['rows'] = sum(generator.row_counts.values())
         
-        print("  - Truncating existing data...")
-        generator.truncate_all()
-        
-        print("  - Generating and inserting data...")
-        generator.generate_and_insert_all()
-        
-        elapsed = time.time() - start_time
+        elapsed = metrics.seconds('generate')
         print(f"  ✓ Data generation completed in {elapsed:.2f} seconds")
+        print(f"    ({', '.join(f'{phase} {seconds:.2f}s' for phase, seconds in generator.timings.items())})")
         print()
         
         print("Step 3: Validating data quality...")
-        validator = DataValidator(reflector)
-        results = validator.validate_all()
+        with metrics.stage('validate'):
+            validator = DataValidator(reflector, metrics=metrics)
+            results = validator.validate_all()
         
         passed = sum(1 for r in results if r.passed)
         failed = sum(1 for r in results if not r.passed)
         print(f"  ✓ Validation completed: {passed} passed, {failed} failed")
+        if validator.cache_hits:
+            print(f"  ✓ Reused cached results for {validator.cache_hits} unchanged rule groups")
         
         if failed > 0:
             print("\n  Failed validations:")
@@ -76,24 +168,29 @@ def main():
         print()
         
         print("Step 4: Generating validation report...")
-        report = validator.generate_report()
-        report_path = Path("validation_report.md")
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report)
+        with metrics.stage('report'):
+            report = validator.generate_report()
+            report_path = Path("validation_report.md")
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(report)
         print(f"  ✓ Validation report saved to: {report_path}")
         print()
         
         print("Step 5: Exporting data to JSON and CSV...")
-        exporter = DataExporter(reflector)
-        export_results = exporter.export_all_tables()
+        json_format = 'jsonl' if args.json_format == 'jsonl' else 'json'
+        with metrics.stage('export') as record:
+            exporter = DataExporter(reflector, compress=args.gzip, metrics=metrics)
+            export_results = exporter.export_all_tables(formats=(json_format, 'csv'))
+            record['rows'] = sum(exporter.row_counts.values())
         
         print(f"  ✓ Exported {len(export_results)} tables to ./exports/")
         for table_name, paths in export_results.items():
-            print(f"    - {table_name}: {Path(paths['json']).name}, {Path(paths['csv']).name}")
+            print(f"    - {table_name}: {', '.join(Path(p).name for p in paths.values())}")
         print()
         
         print("Step 6: Summary...")
-        summary = exporter.get_export_summary()
+        with metrics.stage('summary'):
+            summary = exporter.get_export_summary(mode=args.summary, recorded=generator.row_counts)
         total_records = sum(summary.values())
         print(f"  Total records generated: {total_records}")
         for table_name, count in summary.items():
@@ -106,8 +203,8 @@ def main():
         print()
         print("Output files:")
         print(f"  - Validation report: validation_report.md")
-        print(f"  - Exported data: ./exports/*.json and ./exports/*.csv")
-        print()
+        suffix = '.gz' if args.gzip else ''
+        print(f"  - Exported data: ./exports/*.{json_format}{suffix} and ./exports/*.csv{suffix}")
         
         return 0
         
@@ -116,6 +213,12 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        write_metrics(metrics)
+        print()
+        if profiler is not None:
+            print(profiler.report())
+            print()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""
+Run metrics module.
+Records wall time, CPU time, rows, rows/second and peak RSS for each pipeline stage and
+for the tables (or rule groups) inside it, and writes them as JSON or as a Prometheus
+textfile-collector file.
+
+CPU time is process-wide, so stages running on concurrent worker threads (parallel export
+or validation) each include their neighbours' CPU time; wall time and rows are exact.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils import PeakRss
+
+PROMETHEUS_PREFIX = 'mockdata'
+PROMETHEUS_METRICS = [
+    ('wall_seconds', 'wall_seconds', 'Wall-clock seconds spent in the stage.'),
+    ('cpu_seconds', 'cpu_seconds', 'Process CPU seconds spent in the stage.'),
+    ('rows', 'rows', 'Rows produced by the stage.'),
+    ('rows_per_sec', 'rows_per_second', 'Rows produced per wall-clock second.'),
+    ('peak_rss_bytes', 'peak_rss_bytes', 'Peak resident set size during the stage.'),
+]
+
+
+class Metrics:
+    """Collects one record per measured stage, in the order the stages started."""
+
+    def __init__(self):
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.records: List[dict] = []
+
+    @contextmanager
+    def stage(self, stage: str, name: Optional[str] = None, rows: Optional[int] = None):
+        """Measure the ``with`` block; set ``record['rows']`` inside it to report rows produced.
+
+        ``name`` identifies a table, rule group or phase within ``stage``; None is the stage total.
+        """
+        record = {'stage': stage, 'name': name, 'rows': rows}
+        self.records.append(record)
+        rss = PeakRss()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        except BaseException:
+            record['failed'] = True
+            raise
+        finally:
+            wall = time.perf_counter() - wall_start
+            growth = rss.stop()
+            record['wall_seconds'] = round(wall, 6)
+            record['cpu_seconds'] = round(time.process_time() - cpu_start, 6)
+            rows = record['rows']
+            record['rows_per_sec'] = round(rows / wall, 1) if rows is not None and wall > 0 else None
+            record['peak_rss_bytes'] = rss.peak_rss if growth is not None else None
+            record['rss_growth_bytes'] = growth
+
+    def get(self, stage: str, name: Optional[str] = None) -> Optional[dict]:
+        """The latest record for ``stage``/``name``, or None."""
+        for record in reversed(self.records):
+            if record['stage'] == stage and record['name'] == name:
+                return record
+        return None
+
+    def seconds(self, stage: str, name: Optional[str] = None) -> float:
+        """Wall seconds of a finished stage (0.0 if it was not measured)."""
+        record = self.get(stage, name)
+        return record.get('wall_seconds', 0.0) if record else 0.0
+
+    def to_dict(self) -> Dict:
+        return {'started_at': self.started_at, 'pid': os.getpid(), 'stages': self.records}
+
+    def write_json(self, path: str) -> Path:
+        return _write_atomic(path, json.dumps(self.to_dict(), indent=2) + '\n')
+
+    def write_prometheus(self, path: str) -> Path:
+        """Write gauges in the text exposition format, e.g. for node_exporter's textfile collector."""
+        lines = []
+        for key, metric, help_text in PROMETHEUS_METRICS:
+            name = f"{PROMETHEUS_PREFIX}_stage_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for record in self.records:
+                if record.get(key) is None:
+                    continue
+                labels = f'stage="{_escape_label(record["stage"])}"'
+                if record['name'] is not None:
+                    labels += f',name="{_escape_label(record["name"])}"'
+                lines.append(f"{name}{{{labels}}} {record[key]}")
+        return _write_atomic(path, '\n'.join(lines) + '\n')
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomic(path: str, content: str) -> Path:
+    """Write via a temporary file and rename, so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(content, encoding='utf-8')
+    os.replace(tmp, path)
+    return path
@@ -1,44 +1,222 @@
 """
 Schema reflection module using SQLAlchemy.
 Automatically detects tables, columns, primary keys, and foreign keys.
+
+Reflected schemas are kept as snapshots: shared by every SchemaReflector for
+the same database in this process, and persisted to disk keyed by a cheap
+schema fingerprint so a warm start does not reflect the database again.
+Database-free runs take the schema from a cached snapshot or from the DDL script.
 """
-from sqlalchemy import create_engine, MetaData, inspect
+import hashlib
+import os
+import pickle
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+import sqlalchemy
+from sqlalchemy import create_engine, MetaData, inspect, make_url, text
 from sqlalchemy.orm import sessionmaker
 from config import Config
 
 
+class SchemaSnapshot:
+    """Everything the components read from the inspector, captured once."""
+
+    def __init__(self, fingerprint, tables, columns, primary_keys, foreign_keys, metadata):
+        self.fingerprint = fingerprint
+        self.tables = tables
+        self.columns = columns
+        self.primary_keys = primary_keys
+        self.foreign_keys = foreign_keys
+        self.metadata = metadata
+
+    @classmethod
+    def reflect(cls, engine, fingerprint=None):
+        inspector = inspect(engine)
+        tables = inspector.get_table_names()
+        metadata = MetaData()
+        metadata.reflect(bind=engine)
+        return cls(
+            fingerprint,
+            tables,
+            {t: inspector.get_columns(t) for t in tables},
+            {t: inspector.get_pk_constraint(t).get('constrained_columns', []) for t in tables},
+            {t: inspector.get_foreign_keys(t) for t in tables},
+            metadata,
+        )
+
+
+# Snapshots already loaded in this process, by database URL.
+_SNAPSHOTS: Dict[str, SchemaSnapshot] = {}
+
+
+def schema_fingerprint(engine) -> Optional[str]:
+    """Hash of the catalog rows describing the schema; None when the dialect has no cheap source."""
+    with engine.connect() as conn:
+        if engine.dialect.name == 'mysql':
+            rows = conn.execute(text(
+                "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_DEFAULT, EXTRA "
+                "FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() "
+                "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+            )).fetchall()
+            rows += conn.execute(text(
+                "SELECT TABLE_NAME, CONSTRAINT_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME "
+                "FROM information_schema.KEY_COLUMN_USAGE WHERE TABLE_SCHEMA = DATABASE() "
+                "ORDER BY TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION"
+            )).fetchall()
+        elif engine.dialect.name == 'sqlite':
+            rows = conn.execute(text("SELECT type, name, tbl_name, sql FROM sqlite_master ORDER BY name")).fetchall()
+        else:
+            return None
+    digest = hashlib.sha256(repr([tuple(r) for r in rows]).encode('utf-8'))
+    digest.update(sqlalchemy.__version__.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _read_snapshot(path: Path) -> Optional[SchemaSnapshot]:
+    """Unpickle a cached snapshot; None if the file is unreadable (e.g. truncated by a killed run)."""
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+
+def _write_snapshot(path: Path, snapshot: SchemaSnapshot):
+    """Pickle via a temporary file and rename, so readers never see a partial snapshot."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(engine, database_url: str, cache_dir: Optional[str] = None) -> SchemaSnapshot:
+    """Return the schema snapshot for a database: in-process first, then disk, then full reflection."""
+    if database_url in _SNAPSHOTS:
+        return _SNAPSHOTS[database_url]
+    cache_dir = cache_dir if cache_dir is not None else Config.SCHEMA_CACHE_DIR
+    fingerprint = schema_fingerprint(engine) if cache_dir else None
+    cache_path = None
+    if fingerprint is not None:
+        db_key = hashlib.sha256(database_url.encode('utf-8')).hexdigest()[:12]
+        cache_path = Path(cache_dir) / f"{engine.dialect.name}-{db_key}-{fingerprint[:16]}.pickle"
+    snapshot = _read_snapshot(cache_path) if cache_path is not None and cache_path.exists() else None
+    if snapshot is None:
+        snapshot = SchemaSnapshot.reflect(engine, fingerprint)
+        if cache_path is not None:
+            _write_snapshot(cache_path, snapshot)
+    _SNAPSHOTS[database_url] = snapshot
+    return snapshot
+
+
+def invalidate_snapshot(database_url: str):
+    """Forget the in-process snapshot (after DDL); the next load re-checks the fingerprint."""
+    _SNAPSHOTS.pop(database_url, None)
+
+
+def load_cached_snapshot(database_url: str, cache_dir: Optional[str] = None) -> Optional[SchemaSnapshot]:
+    """Most recent readable on-disk snapshot for a database, without connecting to it (None if there is none)."""
+    cache_dir = cache_dir if cache_dir is not None else Config.SCHEMA_CACHE_DIR
+    if not cache_dir:
+        return None
+    db_key = hashlib.sha256(database_url.encode('utf-8')).hexdigest()[:12]
+    candidates = sorted(Path(cache_dir).glob(f"*-{db_key}-*.pickle"), key=lambda p: p.stat().st_mtime)
+    for path in reversed(candidates):
+        snapshot = _read_snapshot(path)
+        if snapshot is not None:
+            return snapshot
+    return None
+
+
+def schema_from_sql(path: str) -> MetaData:
+    """Build MetaData from the MySQL DDL script without a server.
+
+    The CREATE TABLE statements are rewritten into SQLite's dialect, replayed into an in-memory
+    database and reflected, so tables, column types and lengths, keys and indexes match the script.
+    """
+    statements = []
+    for statement in Path(path).read_text(encoding='utf-8').split(';'):
+        statement = re.sub(r'--[^\n]*', '', statement).strip()
+        if not statement.upper().startswith('CREATE TABLE'):
+            continue
+        table_name = re.match(r'CREATE TABLE\s+(?:IF NOT EXISTS\s+)?`?(\w+)`?', statement, re.I).group(1)
+        statement = re.sub(r'\)\s*ENGINE\s*=.*$', ')', statement, flags=re.S | re.I)
+        statement = re.sub(r'\bint\(\d+\)(\s+unsigned)?', 'INTEGER', statement, flags=re.I)
+        statement = re.sub(r'\s+AUTO_INCREMENT\b', '', statement, flags=re.I)
+        indexes = re.findall(r',\s*(?:KEY|INDEX)\s+`?(\w+)`?\s*(\([^)]*\))', statement, flags=re.I)
+        statement = re.sub(r',\s*(?:KEY|INDEX)\s+`?\w+`?\s*\([^)]*\)', '', statement, flags=re.I)
+        statements.append(statement)
+        statements.extend(f"CREATE INDEX {name} ON {table_name} {columns}" for name, columns in indexes)
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+    metadata = MetaData()
+    metadata.reflect(bind=engine)
+    engine.dispose()
+    return metadata
+
+
 class SchemaReflector:
     """Reflects database schema and provides metadata about tables and relationships."""
     
-    def __init__(self, database_url=None):
-        """Initialize schema reflector with database connection."""
+    def __init__(self, database_url=None, load_mode=None):
+        """Initialize schema reflector with database connection.
+
+        ``load_mode`` (default LOAD_MODE) is the mode rows will be loaded with over this engine.
+        """
         self.database_url = database_url or Config.get_database_url()
-        self.engine = create_engine(self.database_url, echo=False)
+        connect_args = {}
+        if (load_mode or Config.LOAD_MODE) == 'bulk' and make_url(self.database_url).get_backend_name() == 'mysql':
+            # LOAD DATA LOCAL INFILE is refused unless the client opts in.
+            connect_args['local_infile'] = True
+        self.engine = create_engine(self.database_url, echo=False, pool_size=Config.DB_POOL_SIZE,
+                                    connect_args=connect_args)
         self.metadata = MetaData()
-        self.inspector = inspect(self.engine)
         self.Session = sessionmaker(bind=self.engine)
-        
+        self._snapshot: Optional[SchemaSnapshot] = None
+        self._inspector = None
+    
+    @property
+    def inspector(self):
+        if self._inspector is None:
+            self._inspector = inspect(self.engine)
+        return self._inspector
+    
+    @property
+    def snapshot(self) -> SchemaSnapshot:
+        if self._snapshot is None:
+            self._snapshot = load_snapshot(self.engine, self.database_url)
+        return self._snapshot
+    
+    def invalidate(self):
+        """Forget the snapshot after DDL on this database; the next access reloads it."""
+        invalidate_snapshot(self.database_url)
+        self._snapshot = None
+        self._inspector = None
+    
     def reflect_schema(self):
-        """Reflect all tables from the database."""
-        self.metadata.reflect(bind=self.engine)
+        """Reflect all tables from the database (served from the schema snapshot)."""
+        self.metadata = self.snapshot.metadata
         return self.metadata
     
     def get_all_tables(self):
         """Get list of all table names in the database."""
-        return self.inspector.get_table_names()
+        return list(self.snapshot.tables)
     
     def get_table_columns(self, table_name):
         """Get column information for a specific table."""
-        return self.inspector.get_columns(table_name)
+        return self.snapshot.columns[table_name]
     
     def get_primary_keys(self, table_name):
         """Get primary key columns for a specific table."""
-        pk_constraint = self.inspector.get_pk_constraint(table_name)
-        return pk_constraint.get('constrained_columns', [])
+        return list(self.snapshot.primary_keys[table_name])
     
     def get_foreign_keys(self, table_name):
         """Get foreign key relationships for a specific table."""
-        return self.inspector.get_foreign_keys(table_name)
+        return self.snapshot.foreign_keys[table_name]
     
     def get_table_dependencies(self):
         """
@@ -0,0 +1,127 @@
+"""
+SQL profiling module.
+Listens to an engine's before/after_cursor_execute events and aggregates every statement
+by its normalized text (literals, bind parameters and IN / VALUES / CASE lists collapsed),
+recording executions, total and p95 latency, and rows reported by the cursor.
+
+Only statements sent through SQLAlchemy are seen: SQLite bulk loads on the raw DB-API
+cursor are not. For streamed SELECTs the latency covers the execute call, not the fetches.
+"""
+import math
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import Config
+
+SAMPLE_LIMIT = 10000
+
+_NORMALIZE = [
+    (re.compile(r"\s+"), ' '),
+    (re.compile(r"'(?:[^'\\]|\\.|'')*'"), '?'),
+    (re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+"), '?'),
+    (re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b"), '?'),
+    (re.compile(r"\?(?:\s*,\s*\?)+"), '?, ...'),
+    (re.compile(r"(?:WHEN \? THEN \? ?){2,}", re.IGNORECASE), 'WHEN ? THEN ? ... '),
+    (re.compile(r"(\(\?(?:, \.\.\.)?\))(?:\s*,\s*\(\?(?:, \.\.\.)?\))+"), r'\1, ...'),
+]
+
+
+def normalize_statement(statement: str) -> str:
+    """Statement text with literals and parameters replaced by ``?`` and repeated lists collapsed."""
+    for pattern, replacement in _NORMALIZE:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+class StatementStats:
+    """Aggregates for one normalized statement; latencies beyond SAMPLE_LIMIT are reservoir-sampled."""
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.samples: List[float] = []
+
+    def add(self, seconds: float, rows: int, rng: random.Random):
+        self.count += 1
+        self.total += seconds
+        if rows > 0:
+            self.rows += rows
+        if len(self.samples) < SAMPLE_LIMIT:
+            self.samples.append(seconds)
+        else:
+            slot = rng.randrange(self.count)
+            if slot < SAMPLE_LIMIT:
+                self.samples[slot] = seconds
+
+    @property
+    def p95(self) -> float:
+        """Nearest-rank 95th percentile of the sampled latencies."""
+        ordered = sorted(self.samples)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1] if ordered else 0.0
+
+
+class SqlProfiler:
+    """Opt-in statement profiler; attach() it to an engine before the work to be measured."""
+
+    def __init__(self):
+        self.stats: Dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+        # Own generator: the data generator's output depends on the global random state.
+        self._rng = random.Random(0)
+        self._engines: List[Engine] = []
+
+    def attach(self, engine: Engine) -> 'SqlProfiler':
+        event.listen(engine, 'before_cursor_execute', self._before)
+        event.listen(engine, 'after_cursor_execute', self._after)
+        self._engines.append(engine)
+        return self
+
+    def detach(self):
+        for engine in self._engines:
+            event.remove(engine, 'before_cursor_execute', self._before)
+            event.remove(engine, 'after_cursor_execute', self._after)
+        self._engines = []
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        context._profiler_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_profiler_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        rows = cursor.rowcount if cursor.rowcount is not None else -1
+        key = normalize_statement(statement)
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = StatementStats(key)
+            stats.add(elapsed, rows, self._rng)
+
+    def top(self, n: Optional[int] = None) -> List[StatementStats]:
+        """Statements ordered by total time, the ``n`` most expensive first."""
+        with self._lock:
+            ordered = sorted(self.stats.values(), key=lambda s: s.total, reverse=True)
+        return ordered[:n] if n else ordered
+
+    def report(self, n: Optional[int] = None, width: int = 110) -> str:
+        n = n or Config.SQL_PROFILE_TOP
+        top = self.top(n)
+        executions = sum(s.count for s in self.stats.values())
+        total = sum(s.total for s in self.stats.values())
+        lines = [f"SQL profile: top {len(top)} of {len(self.stats)} statements by total time "
+                 f"({executions} executions, {total:.2f}s)",
+                 f"  {'count':>8} {'total s':>9} {'mean ms':>9} {'p95 ms':>9} {'rows':>10}  statement"]
+        for s in top:
+            text = s.statement if len(s.statement) <= width else s.statement[:width - 3] + '...'
+            lines.append(f"  {s.count:>8} {s.total:>9.3f} {s.total / s.count * 1000:>9.2f} "
+                         f"{s.p95 * 1000:>9.2f} {s.rows:>10}  {text}")
+        return '\n'.join(lines)
@@ -22,6 +22,20 @@ def test_imports():
         print("  ✓ data_validator")
         import data_exporter
         print("  ✓ data_exporter")
+        import key_registry
+        print("  ✓ key_registry")
+        import value_pool
+        print("  ✓ value_pool")
+        import bulk_loader
+        print("  ✓ bulk_loader")
+        import benchmark
+        print("  ✓ benchmark")
+        import metrics
+        print("  ✓ metrics")
+        import sql_profiler
+        print("  ✓ sql_profiler")
+        import counter_rng
+        print("  ✓ counter_rng")
         return True
     except ImportError as e:
         print(f"  ❌ Import error: {e}")
@@ -38,6 +52,10 @@ def test_config():
         print(f"  ✓ NUM_CUSTOMERS: {Config.NUM_CUSTOMERS}")
         url = Config.get_database_url()
         print(f"  ✓ Database URL generated (credentials hidden)")
+        from config import parse_table_map
+        assert parse_table_map('banking_transactions=20000, loan=500') == {'banking_transactions': 20000, 'loan': 500}
+        assert parse_table_map('') == {}
+        print(f"  ✓ Per-table overrides parsed")
         return True
     except Exception as e:
         print(f"  ❌ Config error: {e}")
@@ -68,6 +86,41 @@ def test_utils():
         assert cc.isdigit(), f"Expected digits only, got {cc}"
         print(f"  ✓ Credit card number generation: {cc[:4]}...")
         
+        from utils import get_rng, past_dates, money, rows_from_columns
+        rows = rows_from_columns({'Amount': money(get_rng(42).uniform(1, 2500, size=3)), 'Date': past_dates(get_rng(42), 3, 0, 5)})
+        assert rows == rows_from_columns({'Amount': money(get_rng(42).uniform(1, 2500, size=3)), 'Date': past_dates(get_rng(42), 3, 0, 5)})
+        assert isinstance(rows[0]['Amount'], float) and hasattr(rows[0]['Date'], 'isoformat')
+        print(f"  ✓ Vectorized columns are reproducible: {rows[0]['Amount']}")
+        
+        from datetime import date
+        from utils import future_dates
+        expiry = future_dates(get_rng(42), 100, 1, 5).tolist()
+        assert all(1 <= d.year - date.today().year <= 5 for d in expiry)
+        print(f"  ✓ Vectorized future dates fall 1-5 years ahead")
+        
+        from utils import derive_seed
+        assert derive_seed(42, 'customers', 0) == derive_seed(42, 'customers', 0)
+        assert derive_seed(42, 'customers', 0) != derive_seed(42, 'customers', 1)
+        print(f"  ✓ Per-shard seeds are stable and distinct")
+        
+        from value_pool import ValuePools
+        pool = ValuePools(42, size=50, cache_dir='').get('city', 5)
+        assert len(pool) == 50 and all(len(v) <= 5 for v in pool.values)
+        assert pool.values == ValuePools(42, size=50, cache_dir='').get('city', 5).values
+        print(f"  ✓ Value pools are seeded and truncated: {pool.values[0]}")
+        
+        import json
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            ValuePools(42, size=50, cache_dir=tmp).get('city', 5)
+            [path] = Path(tmp).glob('*.json')
+            for damaged in ('["Par', json.dumps(pool.values[:10])):
+                path.write_text(damaged, encoding='utf-8')
+                assert ValuePools(42, size=50, cache_dir=tmp).get('city', 5).values == pool.values
+                assert json.loads(path.read_text(encoding='utf-8')) == pool.values
+            assert [p.name for p in Path(tmp).iterdir()] == [path.name]
+        print(f"  ✓ Corrupt or wrong-sized pool files rebuilt and rewritten")
+        
         return True
     except Exception as e:
         print(f"  ❌ Utils error: {e}")
@@ -86,6 +139,13 @@ def test_file_structure():
         'data_validator.py',
         'data_exporter.py',
         'utils.py',
+        'key_registry.py',
+        'value_pool.py',
+        'bulk_loader.py',
+        'benchmark.py',
+        'metrics.py',
+        'sql_profiler.py',
+        'counter_rng.py',
         'requirements.txt',
         '.env.example',
         'Sql_code.txt',
@@ -104,6 +164,529 @@ def test_file_structure():
     
     return all_exist
 
+def test_key_registry():
+    """Test client-side primary key allocation."""
+    print("\nTesting key registry...")
+    try:
+        from sqlalchemy import MetaData, Table, Column, Integer, String
+        from key_registry import KeyRegistry
+        
+        metadata = MetaData()
+        Table('branches', metadata, Column('Branch_id', Integer, primary_key=True), Column('City', String(25)))
+        Table('account_type', metadata, Column('Account_Type', String(20), primary_key=True))
+        keys = KeyRegistry(metadata)
+        
+        rows = [{'City': 'A'}, {'City': 'B'}]
+        assert keys.assign('branches', rows) == [1, 2]
+        assert rows[1]['Branch_id'] == 2
+        assert list(keys.reserve('branches', 3)) == [3, 4, 5]
+        print(f"  ✓ Contiguous keys assigned: {[r['Branch_id'] for r in rows]}")
+        
+        assert keys.assign('account_type', [{'Account_Type': 'Checking'}]) == []
+        print(f"  ✓ Natural keys left untouched")
+        return True
+    except Exception as e:
+        print(f"  ❌ Key registry error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_counter_rng():
+    """Test that counter-based rows depend only on their position."""
+    print("\nTesting counter-based generation...")
+    try:
+        import warnings
+        import numpy as np
+        from counter_rng import CounterRng, CounterRows
+        from schema_reflector import schema_from_sql
+        from value_pool import ValuePools
+        
+        rng = CounterRng(42, 'loan')
+        values = rng.integers('Amount', np.arange(1000), 5, 20)
+        assert values.min() == 5 and values.max() == 20
+        assert (rng.integers('Amount', np.array([999, 3]), 5, 20) == values[[999, 3]]).all()
+        assert not (CounterRng(42, 'loan').bits('Rate', np.arange(8)) == rng.bits('Amount', np.arange(8))).any()
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            assert rng.integers('Amount', 999, 5, 20) == values[999]
+        print("  ✓ Draws are a function of (seed, table, column, row)")
+        
+        rows = CounterRows(42, schema_from_sql('Sql_code.txt'), ValuePools(42, size=50, cache_dir=''))
+        everyone = rows.customers(np.arange(10))
+        one = rows.customers(np.array([7]))
+        assert all(one[col][0] == everyone[col][7] for col in everyone)
+        print("  ✓ A single customer regenerated without the rows before it")
+        
+        ids = np.arange(101, 111)
+        full = rows.banking_transactions(np.arange(10), ids)
+        alone = rows.banking_transactions(np.array([3]), ids)
+        mask = full['Customer_id'] == 104
+        assert mask.sum() == len(alone['Amount']) and (full['Amount'][mask] == alone['Amount']).all()
+        print("  ✓ Child rows regenerated from their parent alone")
+        return True
+    except Exception as e:
+        print(f"  ❌ Counter RNG error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_bulk_loader():
+    """Test the staged CSV format used by LOAD DATA and the SQLite fast path."""
+    print("\nTesting bulk loader...")
+    try:
+        import tempfile
+        from datetime import date
+        from sqlalchemy import MetaData, Table, Column, Integer, String, Date, create_engine, select
+        from bulk_loader import MySQLLoader, RowLoader, get_loader
+        
+        metadata = MetaData()
+        table = Table('customers', metadata, Column('Customer_id', Integer, primary_key=True),
+                      Column('Name', String(40)), Column('Date_of_Birth', Date), Column('Phone', String(12)))
+        rows = [{'Customer_id': 1, 'Name': "O'Neil, \"Jo\"", 'Date_of_Birth': date(1990, 5, 1), 'Phone': None},
+                {'Customer_id': 2, 'Name': 'back\\slash', 'Date_of_Birth': date(1985, 1, 2), 'Phone': '555'}]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'customers.csv'
+            columns = MySQLLoader().stage(table, rows, path)
+            assert columns == ['Customer_id', 'Name', 'Date_of_Birth', 'Phone']
+            assert path.read_text(encoding='utf-8') == (
+                '1,"O\'Neil, ""Jo""",1990-05-01,\\N\n'
+                '2,back\\\\slash,1985-01-02,555\n'
+            )
+        print("  ✓ Staged CSV follows LOAD DATA conventions (quoting, \\N, escaped backslashes)")
+        
+        engine = create_engine('sqlite://')
+        metadata.create_all(engine)
+        with engine.begin() as conn:
+            get_loader('bulk', 'sqlite').load(conn, table, rows)
+            loaded = [dict(r._mapping) for r in conn.execute(select(table).order_by(table.c.Customer_id))]
+        assert loaded == rows
+        assert type(get_loader('bulk', 'postgresql')) is RowLoader
+        print("  ✓ SQLite bulk path round-trips rows; other dialects fall back to inserts")
+        
+        from sqlalchemy import event
+        from schema_reflector import SchemaReflector
+        
+        def connect_args(load_mode):
+            captured = {}
+            reflector = SchemaReflector('mysql+pymysql://user:pw@127.0.0.1:1/db', load_mode=load_mode)
+            
+            @event.listens_for(reflector.engine, 'do_connect')
+            def capture(dialect, conn_rec, cargs, cparams):
+                captured.update(cparams)
+                raise RuntimeError('not connecting')
+            
+            try:
+                reflector.engine.connect()
+            except Exception:
+                pass
+            reflector.engine.dispose()
+            return captured
+        
+        assert connect_args('bulk').get('local_infile') is True
+        assert 'local_infile' not in connect_args('insert')
+        print("  ✓ MySQL engine opts into LOCAL INFILE for the requested load mode")
+        return True
+    except Exception as e:
+        print(f"  ❌ Bulk loader error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_direct_export():
+    """Test database-free export: schema parsed from the DDL script, rows written like a DB export."""
+    print("\nTesting direct export...")
+    try:
+        import tempfile
+        from datetime import date
+        from schema_reflector import schema_from_sql
+        from data_exporter import DirectExporter
+        
+        metadata = schema_from_sql('Sql_code.txt')
+        assert len(metadata.tables) == 11
+        assert [c.name for c in metadata.tables['credit_cards'].primary_key.columns] == ['CC_number']
+        assert metadata.tables['accounts'].c.Account_Balance.type.scale == 2
+        print(f"  ✓ Parsed {len(metadata.tables)} tables from Sql_code.txt")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            exporter = DirectExporter(metadata, export_dir=tmp, formats=['csv'])
+            table = metadata.tables['account_type']
+            exporter.load(None, table, [{'Account_Type': 'Savings', 'Minimum_Balance_Restriction': 100.5},
+                                        {'Account_Type': 'Checking', 'Minimum_Balance_Restriction': 25}])
+            paths = exporter.close()
+            content = Path(paths['account_type']['csv']).read_text(encoding='utf-8')
+            assert content.splitlines() == ['Account_Type,Minimum_Balance_Restriction', 'Checking,25.00', 'Savings,100.50']
+            assert Path(paths['loan']['csv']).exists()
+        print("  ✓ Rows sorted by primary key, decimals formatted to scale, empty tables exported")
+        
+        import gzip
+        import time
+        with tempfile.TemporaryDirectory() as tmp:
+            outputs = []
+            for run in ('a', 'b'):
+                if outputs:
+                    time.sleep(1.1)  # gzip headers carry a timestamp in seconds
+                exporter = DirectExporter(metadata, export_dir=str(Path(tmp) / run), formats=['json', 'csv'],
+                                          compress=True)
+                exporter.load(None, metadata.tables['account_type'],
+                              [{'Account_Type': 'Savings', 'Minimum_Balance_Restriction': 100.5}])
+                outputs.append(exporter.close()['account_type'])
+            for fmt in ('json', 'csv'):
+                assert Path(outputs[0][fmt]).read_bytes() == Path(outputs[1][fmt]).read_bytes()
+            assert 'Savings,100.50' in gzip.decompress(Path(outputs[0]['csv']).read_bytes()).decode('utf-8')
+        print("  ✓ Compressed exports are byte-identical across runs")
+        return True
+    except Exception as e:
+        print(f"  ❌ Direct export error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_validation_cache():
+    """Test that cached validation results are keyed on table watermarks."""
+    print("\nTesting validation cache...")
+    try:
+        import tempfile
+        from data_validator import ValidationCache, ValidationResult
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'validation_cache.json'
+            header = {'database': 'db', 'schema': 'fp', 'sample_size': 5}
+            fingerprint = [['loan', 10, '10', 'abc']]
+            cache = ValidationCache(path, header)
+            cache.put('Business/Loans', fingerprint, [ValidationResult('Business', 'Loans', True, '0 loans')])
+            cache.save()
+            
+            cached = ValidationCache(path, header).get('Business/Loans', fingerprint)
+            assert [(r.rule, r.passed, r.details) for r in cached] == [('Loans', True, '0 loans')]
+            print("  ✓ Results reused for unchanged watermarks")
+            
+            assert ValidationCache(path, header).get('Business/Loans', [['loan', 11, '11', 'abd']]) is None
+            assert ValidationCache(path, dict(header, schema='other')).get('Business/Loans', fingerprint) is None
+            print("  ✓ Changed table or schema invalidates the entry")
+            
+            from sqlalchemy import text
+            from data_validator import DataValidator, ValidationTask
+            from schema_reflector import SchemaReflector
+            reflector = SchemaReflector(f"sqlite:///{Path(tmp) / 'cache.db'}")
+            with reflector.engine.begin() as conn:
+                conn.execute(text("CREATE TABLE loan (Loan_id INTEGER PRIMARY KEY, Amount REAL)"))
+                conn.execute(text("INSERT INTO loan VALUES (1, 10.0), (2, 20.0)"))
+            reflector.reflect_schema()
+            validator = DataValidator(reflector)
+            checksummed = []
+            table_checksum = validator.table_checksum
+            validator.table_checksum = lambda conn, t: checksummed.append(t) or table_checksum(conn, t)
+            tasks = [ValidationTask("Business", "Loans", lambda: None, tables=['loan'])]
+            
+            first = validator.task_fingerprints(tasks, {})
+            assert first == [[['loan', 2, '2', None]]] and checksummed == []
+            validator.complete_fingerprints(first)
+            assert first[0][0][3] is not None and checksummed == ['loan']
+            cache = ValidationCache(path, header)
+            cache.put('Business/Loans', first[0], [])
+            assert validator.task_fingerprints(tasks, cache.watermarks()) == first
+            assert checksummed == ['loan', 'loan']
+            with reflector.engine.begin() as conn:
+                conn.execute(text("INSERT INTO loan VALUES (3, 30.0)"))
+            assert validator.task_fingerprints(tasks, cache.watermarks()) == [[['loan', 3, '3', None]]]
+            assert checksummed == ['loan', 'loan']
+            print("  ✓ Checksum skipped when row count or max key already differs")
+            
+            from config import Config
+            cache_dir, Config.SCHEMA_CACHE_DIR = Config.SCHEMA_CACHE_DIR, ''
+            try:
+                reflector.invalidate()
+                cache = validator.open_cache(str(Path(tmp) / 'results.json'))
+                cache.put('Business/Loans', first[0], [])
+                cache.save()
+                assert validator.open_cache(str(Path(tmp) / 'results.json')).get('Business/Loans', first[0]) == []
+                with reflector.engine.begin() as conn:
+                    conn.execute(text("ALTER TABLE loan RENAME COLUMN Amount TO Loan_Amount"))
+                reflector.invalidate()
+                assert DataValidator(reflector).open_cache(str(Path(tmp) / 'results.json')).get(
+                    'Business/Loans', first[0]) is None
+            finally:
+                Config.SCHEMA_CACHE_DIR = cache_dir
+            reflector.engine.dispose()
+            print("  ✓ Altered column invalidates cached results without a schema cache directory")
+        return True
+    except Exception as e:
+        print(f"  ❌ Validation cache error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_metrics():
+    """Test that run metrics record nested stages and export as JSON and Prometheus text."""
+    print("\nTesting run metrics...")
+    try:
+        import json
+        import tempfile
+        from metrics import Metrics
+        
+        metrics = Metrics()
+        with metrics.stage('generate') as total:
+            with metrics.stage('generate', 'customers') as record:
+                record['rows'] = 100
+            total['rows'] = 100
+        try:
+            with metrics.stage('export', 'loan'):
+                raise RuntimeError("disk full")
+        except RuntimeError:
+            pass
+        
+        assert [(r['stage'], r['name']) for r in metrics.records] == [
+            ('generate', None), ('generate', 'customers'), ('export', 'loan')]
+        customers = metrics.get('generate', 'customers')
+        assert customers['rows'] == 100 and customers['wall_seconds'] >= 0 and customers['cpu_seconds'] >= 0
+        assert customers['rows_per_sec'] is not None
+        assert metrics.get('export', 'loan')['failed'] and metrics.get('export', 'loan')['rows_per_sec'] is None
+        print("  ✓ Nested stages recorded in start order, failures flagged")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            data = json.loads(metrics.write_json(Path(tmp) / 'metrics.json').read_text())
+            assert len(data['stages']) == 3
+            prom = metrics.write_prometheus(Path(tmp) / 'metrics.prom').read_text()
+            assert '# TYPE mockdata_stage_wall_seconds gauge' in prom
+            assert 'mockdata_stage_rows{stage="generate",name="customers"} 100' in prom
+            assert 'mockdata_stage_rows{stage="export"' not in prom
+        print("  ✓ JSON and Prometheus textfile written")
+        return True
+    except Exception as e:
+        print(f"  ❌ Metrics error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_sql_profiler():
+    """Test that the SQL profiler groups statements by normalized text."""
+    print("\nTesting SQL profiler...")
+    try:
+        from sqlalchemy import create_engine, text
+        from sql_profiler import SqlProfiler, StatementStats, normalize_statement
+        
+        assert normalize_statement("SELECT * FROM loan WHERE id IN (%(id_1_1)s, %(id_1_2)s)\n  AND x = 'a'") == \
+            "SELECT * FROM loan WHERE id IN (?, ...) AND x = ?"
+        assert normalize_statement("INSERT INTO t (a, b) VALUES (1, 'x'), (2, 'y')") == \
+            "INSERT INTO t (a, b) VALUES (?, ...), ..."
+        assert normalize_statement("UPDATE t SET s=CASE t.id WHEN ? THEN ? WHEN ? THEN ? END") == \
+            "UPDATE t SET s=CASE t.id WHEN ? THEN ? ... END"
+        print("  ✓ Literals, parameters and repeated lists normalized")
+        
+        engine = create_engine('sqlite://')
+        profiler = SqlProfiler().attach(engine)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)"))
+            conn.execute(text("INSERT INTO t (id, v) VALUES (:id, :v)"), [{'id': i, 'v': 'x'} for i in range(5)])
+            for i in range(3):
+                conn.execute(text(f"SELECT v FROM t WHERE id = {i}")).fetchall()
+        profiler.detach()
+        stats = {s.statement: s for s in profiler.top()}
+        assert stats['SELECT v FROM t WHERE id = ?'].count == 3
+        assert stats['INSERT INTO t (id, v) VALUES (?, ...)'].rows == 5
+        assert 'SELECT v FROM t WHERE id = ?' in profiler.report(5)
+        print("  ✓ Executions, rows and report aggregated per statement")
+        
+        for samples, expected in [(range(1, 21), 19), (range(1, 101), 95), ([7], 7)]:
+            s = StatementStats('SELECT ?')
+            s.samples = [float(x) for x in reversed(samples)]
+            assert s.p95 == expected, (list(samples)[-1], s.p95)
+        print("  ✓ p95 uses the nearest rank")
+        return True
+    except Exception as e:
+        print(f"  ❌ SQL profiler error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_benchmark_compare():
+    """Test that benchmark comparison flags throughput and memory regressions."""
+    print("\nTesting benchmark comparison...")
+    try:
+        from benchmark import compare_results
+        
+        def result(name, rows_per_sec, peak_mb, seconds=1.0):
+            return {'scale': 1000, 'stage': 'generate', 'name': name, 'rows': 1000,
+                    'seconds': seconds, 'rows_per_sec': rows_per_sec, 'peak_mb': peak_mb}
+        
+        baseline = {'results': [result('customers', 1000, 10.0), result('loans', 1000, 10.0),
+                                result('branches', 1000, 0.5, seconds=0.001)]}
+        current = {'results': [result('customers', 700, 10.0), result('loans', 950, 20.0),
+                               result('branches', 100, 5.0, seconds=0.01)]}
+        rows = {r['name']: r['regressions'] for r in compare_results(baseline, current, 0.15)}
+        assert rows['customers'] == ['throughput']
+        print("  ✓ Throughput drop beyond the threshold flagged")
+        assert rows['loans'] == ['memory']
+        print("  ✓ Peak memory growth flagged")
+        assert rows['branches'] == []
+        print("  ✓ Measurements too small to time reliably ignored")
+        return True
+    except Exception as e:
+        print(f"  ❌ Benchmark comparison error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_sharded_workers():
+    """Test that sharded generation exports the same data with one worker and with several."""
+    print("\nTesting sharded generation...")
+    try:
+        import filecmp
+        import tempfile
+        from config import Config
+        from data_exporter import DataExporter
+        from data_generator import DataGenerator
+        from schema_reflector import SchemaReflector, schema_from_sql
+        
+        names = ['NUM_CUSTOMERS', 'NUM_ACCOUNTS', 'NUM_EMPLOYEES', 'NUM_BRANCHES', 'SHARD_SIZE', 'SCHEMA_CACHE_DIR']
+        saved = {name: getattr(Config, name) for name in names}
+        with tempfile.TemporaryDirectory() as tmp:
+            Config.NUM_CUSTOMERS = Config.NUM_ACCOUNTS = 120
+            Config.NUM_EMPLOYEES = Config.NUM_BRANCHES = 10
+            Config.SHARD_SIZE = 25
+            Config.SCHEMA_CACHE_DIR = ''
+            try:
+                for workers in (1, 3):
+                    url = f"sqlite:///{Path(tmp) / f'workers{workers}.db'}"
+                    reflector = SchemaReflector(url)
+                    schema_from_sql('Sql_code.txt').create_all(reflector.engine)
+                    DataGenerator(reflector=reflector, seed=42, sharded=True, workers=workers).generate_and_insert_all()
+                    exporter = DataExporter(reflector, export_dir=str(Path(tmp) / f'workers{workers}'))
+                    for table_name in reflector.get_all_tables():
+                        exporter.export_table(table_name)
+                    reflector.close()
+            finally:
+                for name, value in saved.items():
+                    setattr(Config, name, value)
+            files = sorted(p.name for p in (Path(tmp) / 'workers1').iterdir())
+            assert files == sorted(p.name for p in (Path(tmp) / 'workers3').iterdir()) and len(files) == 22
+            match, mismatch, errors = filecmp.cmpfiles(Path(tmp) / 'workers1', Path(tmp) / 'workers3', files,
+                                                       shallow=False)
+            assert not mismatch and not errors, mismatch + errors
+        print(f"  ✓ {len(files)} export files identical with 1 and 3 workers")
+        return True
+    except Exception as e:
+        print(f"  ❌ Sharded generation error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_schema_snapshot():
+    """Test that the cached schema snapshot is dropped after DDL."""
+    print("\nTesting schema snapshot...")
+    try:
+        import tempfile
+        from sqlalchemy import text
+        from config import Config
+        from data_generator import DataGenerator
+        from schema_reflector import SchemaReflector, load_cached_snapshot, schema_from_sql
+        
+        cache_dir = Config.SCHEMA_CACHE_DIR
+        with tempfile.TemporaryDirectory() as tmp:
+            Config.SCHEMA_CACHE_DIR = str(Path(tmp) / 'schema_cache')
+            url = f"sqlite:///{Path(tmp) / 'schema.db'}"
+            reflector = SchemaReflector(url)
+            try:
+                schema_from_sql('Sql_code.txt').create_all(reflector.engine)
+                assert len(reflector.get_all_tables()) == 11
+                with reflector.engine.begin() as conn:
+                    conn.execute(text("CREATE TABLE audit (id INTEGER PRIMARY KEY)"))
+                assert 'audit' not in SchemaReflector(url).get_all_tables()
+                reflector.invalidate()
+                assert 'audit' in SchemaReflector(url).get_all_tables() and 'audit' in reflector.get_all_tables()
+                print("  ✓ Snapshot reloaded after invalidation")
+                
+                generator = DataGenerator(reflector=reflector)
+                before = reflector.snapshot
+                generator.truncate_all('recreate', defer_indexes=False)
+                assert reflector.snapshot is not before
+                print("  ✓ Recreating the tables invalidates the snapshot")
+                
+                for path in Path(Config.SCHEMA_CACHE_DIR).glob('*.pickle'):
+                    path.write_bytes(path.read_bytes()[:100])
+                reflector.invalidate()
+                assert 'audit' in SchemaReflector(url).get_all_tables()
+                assert 'audit' in load_cached_snapshot(url).tables
+                assert not list(Path(Config.SCHEMA_CACHE_DIR).glob('*.tmp'))
+                print("  ✓ Truncated snapshot files treated as a cache miss and rewritten")
+            finally:
+                Config.SCHEMA_CACHE_DIR = cache_dir
+                reflector.engine.dispose()
+        return True
+    except Exception as e:
+        print(f"  ❌ Schema snapshot error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_validation_timeout():
+    """Test that a slow validation task times out, and is cancelled, with a single worker."""
+    print("\nTesting validation timeout...")
+    try:
+        import tempfile
+        import threading
+        import time
+        from data_validator import DataValidator, ValidationTask
+        from schema_reflector import SchemaReflector
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            reflector = SchemaReflector(f"sqlite:///{Path(tmp) / 'slow.db'}")
+            validator = DataValidator(reflector)
+            slow_query = ("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 1000000000) "
+                          "SELECT count(*) FROM c")
+            task = ValidationTask("Slow", "Slow check", lambda: validator._in_connection(
+                lambda conn: conn.exec_driver_sql(slow_query).scalar()))
+            outputs = {}
+            started = time.monotonic()
+            completed = validator._run_tasks([task], [0], workers=1, timeout=0.3, outputs=outputs)
+            elapsed = time.monotonic() - started
+            assert completed == []
+            assert not outputs[0][0].passed and 'Timed out after 0.3s' in outputs[0][0].details
+            print(f"  ✓ Slow task reported as timed out with one worker ({elapsed:.2f}s)")
+            
+            # Without the cancel the worker thread would run the billion-row query to the end.
+            for thread in threading.enumerate():
+                if thread is not threading.main_thread() and thread.name.startswith('ThreadPoolExecutor'):
+                    thread.join(timeout=5)
+                    assert not thread.is_alive(), "timed-out query still running"
+            print("  ✓ Running statement cancelled")
+            
+            # The slow task finishes between its timeout and the cancel; by then the worker runs
+            # the next task's query on the same connection pool, which must not be interrupted.
+            in_query = threading.Event()
+            
+            class FinishingTask(ValidationTask):
+                @property
+                def category(self):
+                    if threading.current_thread() is threading.main_thread():
+                        in_query.wait(5)
+                    return "Slow"
+                
+                @category.setter
+                def category(self, value):
+                    pass
+            
+            def next_check(conn):
+                conn.connection.dbapi_connection.create_function('started', 0, lambda: in_query.set() or 1)
+                count = conn.exec_driver_sql("WITH RECURSIVE c(x) AS (SELECT started() UNION ALL SELECT x + 1 "
+                                             "FROM c WHERE x < 300000) SELECT count(*) FROM c").scalar()
+                validator.add_result("Next", "Next check", count == 300000)
+            
+            tasks = [FinishingTask("Slow", "Finishing check", lambda: time.sleep(0.5)),
+                     ValidationTask("Next", "Next check", lambda: validator._in_connection(next_check))]
+            outputs = {}
+            completed = validator._run_tasks(tasks, [0, 1], workers=1, timeout=0.3, outputs=outputs)
+            assert completed == [1] and outputs[1][0].passed
+            reflector.engine.dispose()
+            print("  ✓ Next task on the worker left running")
+        return True
+    except Exception as e:
+        print(f"  ❌ Validation timeout error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
 def test_sql_schema():
     """Test that SQL schema file is valid."""
     print("\nTesting SQL schema file...")
@@ -141,6 +724,17 @@ def main():
         ("Imports", test_imports),
         ("Configuration", test_config),
         ("Utilities", test_utils),
+        ("Key Registry", test_key_registry),
+        ("Counter RNG", test_counter_rng),
+        ("Bulk Loader", test_bulk_loader),
+        ("Direct Export", test_direct_export),
+        ("Sharded Generation", test_sharded_workers),
+        ("Schema Snapshot", test_schema_snapshot),
+        ("Validation Cache", test_validation_cache),
+        ("Validation Timeout", test_validation_timeout),
+        ("Run Metrics", test_metrics),
+        ("SQL Profiler", test_sql_profiler),
+        ("Benchmark Comparison", test_benchmark_compare),
         ("SQL Schema", test_sql_schema),
     ]
     
@@ -1,9 +1,16 @@
+import hashlib
+import os
 import random
+import threading
+from contextlib import contextmanager
+from itertools import islice
 import string
 from datetime import date, timedelta
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
+import numpy as np
 from faker import Faker
+import faker.generator
 
 
 def get_faker(seed: int) -> Faker:
@@ -13,6 +20,28 @@ def get_faker(seed: int) -> Faker:
     return fake
 
 
+def derive_seed(base_seed: int, *parts) -> int:
+    """Stable 64-bit seed for a (base seed, table, shard, ...) combination."""
+    key = ':'.join(str(p) for p in (base_seed, *parts)).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+
+
+@contextmanager
+def preserved_random_state():
+    """Restore the global ``random`` and Faker streams after reseeding them for a shard."""
+    state = random.getstate()
+    faker_state = faker.generator.random.getstate()
+    try:
+        yield
+    finally:
+        random.setstate(state)
+        faker.generator.random.setstate(faker_state)
+
+
+def get_rng(seed: int) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
 def clamp_decimal(value, min_value=None, max_value=None):
     if min_value is not None and value < min_value:
         value = min_value
@@ -63,3 +92,77 @@ def random_phone(fake: Faker) -> str:
 
 def random_cc_number() -> str:
     return ''.join(random.choices(string.digits, k=16))
+
+
+def past_dates(rng: np.random.Generator, n: int, years_back_min=0, years_back_max=30) -> np.ndarray:
+    days = rng.integers(years_back_min * 365, years_back_max * 365, size=n, endpoint=True)
+    return np.datetime64(date.today(), 'D') - days.astype('timedelta64[D]')
+
+
+def future_dates(rng: np.random.Generator, n: int, years_ahead_min=1, years_ahead_max=5) -> np.ndarray:
+    """Vectorized future_date: today's date a whole number of years ahead."""
+    today = date.today()
+    options = []
+    for years in range(years_ahead_min, years_ahead_max + 1):
+        try:
+            options.append(date(today.year + years, today.month, today.day))
+        except ValueError:
+            options.append(today + timedelta(days=365 * years))
+    return np.asarray(options, dtype='datetime64[D]')[rng.integers(0, len(options), size=n)]
+
+
+def money(values: np.ndarray) -> np.ndarray:
+    return np.round(values, 2)
+
+
+def rows_from_columns(columns: Dict[str, np.ndarray]) -> List[dict]:
+    """Assemble row dicts from equally sized column arrays (dates come back as datetime.date)."""
+    names = list(columns)
+    values = [columns[name].tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Yield consecutive lists of at most ``size`` items without materialising the input."""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_rss() -> Optional[int]:
+    """Current resident set size in bytes (Linux /proc), or None where it is not available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class PeakRss:
+    """Samples the process RSS on a background thread until stop(); tracks the start and peak values."""
+    INTERVAL = 0.005
+
+    def __init__(self):
+        self.start_rss = read_rss()
+        self.peak_rss = self.start_rss
+        self._done = threading.Event()
+        self._thread = None
+        if self.start_rss is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+
+    def _sample(self):
+        while not self._done.wait(self.INTERVAL):
+            self.peak_rss = max(self.peak_rss, read_rss())
+
+    def stop(self) -> Optional[int]:
+        """Stop sampling and return the peak growth over the starting RSS in bytes (None if unavailable)."""
+        if self._thread is None:
+            return None
+        self._done.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, read_rss())
+        return self.peak_rss - self.start_rss
@@ -0,0 +1,92 @@
+"""
+Pre-sampled value pools for Faker-backed text fields.
+Each pool is built once per (field, max length) from its own seeded Faker
+instance, so rows can draw values by index instead of calling Faker.
+"""
+import hashlib
+import json
+import os
+import random
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import faker
+import numpy as np
+from faker import Faker
+
+from config import Config
+from utils import derive_seed, ensure_max_length
+
+
+class ValuePool:
+    """A fixed list of candidate values for one field."""
+
+    def __init__(self, values: List[str]):
+        self.values = values
+        self._array = np.asarray(values, dtype=object)
+
+    def __len__(self):
+        return len(self.values)
+
+    def draw(self) -> str:
+        return self.values[random.randrange(len(self.values))]
+
+    def take(self, indices: np.ndarray) -> np.ndarray:
+        return self._array[indices]
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return self.take(rng.integers(0, len(self.values), size=n))
+
+
+class ValuePools:
+    """Builds, caches and optionally persists the pools used by a generator."""
+
+    def __init__(self, seed: int, size: Optional[int] = None, cache_dir: Optional[str] = None):
+        self.seed = seed
+        self.size = size or Config.VALUE_POOL_SIZE
+        cache_dir = cache_dir if cache_dir is not None else Config.VALUE_POOL_CACHE_DIR
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        # Keyed on the raw arguments: get() runs once per generated row, so it must not hash a spec each time.
+        self._pools: Dict[tuple, ValuePool] = {}
+
+    def _key(self, field: str, max_len: Optional[int], kwargs: dict) -> str:
+        spec = json.dumps([field, max_len, sorted(kwargs.items()), self.seed, self.size, faker.VERSION])
+        return f"{field}-{hashlib.sha1(spec.encode('utf-8')).hexdigest()[:16]}"
+
+    def _build(self, field: str, max_len: Optional[int], kwargs: dict) -> List[str]:
+        fake = Faker()
+        fake.seed_instance(derive_seed(self.seed, 'pool', field, json.dumps(sorted(kwargs.items()))))
+        provider = getattr(fake, field)
+        return [ensure_max_length(provider(**kwargs), max_len) for _ in range(self.size)]
+
+    def get(self, field: str, max_len: Optional[int] = None, **kwargs) -> ValuePool:
+        spec = (field, max_len, tuple(sorted(kwargs.items())))
+        pool = self._pools.get(spec)
+        if pool is not None:
+            return pool
+        key = self._key(field, max_len, kwargs)
+        cache_path = self.cache_dir / f"{key}.json" if self.cache_dir else None
+        values = self._read_cached(cache_path) if cache_path is not None else None
+        if values is None:
+            values = self._build(field, max_len, kwargs)
+            if cache_path is not None:
+                self._write_cached(cache_path, values)
+        pool = self._pools[spec] = ValuePool(values)
+        return pool
+
+    def _read_cached(self, path: Path) -> Optional[List[str]]:
+        """The cached pool, or None if it is missing, corrupt or of the wrong size (it is then rebuilt)."""
+        try:
+            values = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(values, list) or len(values) != self.size:
+            return None
+        return values
+
+    def _write_cached(self, path: Path, values: List[str]):
+        """Write via a temporary file and rename, so concurrent runs never read a partial pool."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(values, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, path)